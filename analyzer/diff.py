@@ -4,8 +4,29 @@ diff.py
 Detects attack surface changes between two scans.
 """
 
-import sqlite3
-from typing import Dict, Set, Tuple
+from typing import Dict, FrozenSet, Optional, Tuple
+
+from logger.storage import StorageEngine
+
+
+# Open (host, port) pairs present in the first scan but not in the second.
+# Written as an anti-join: rows of the first scan are streamed and each one
+# probes the covering index for the second scan, so no temporary b-tree is
+# built for either side (the shape EXCEPT would otherwise use).
+_SQL_OPEN_PORTS_NOT_IN = """
+    SELECT cur.host, cur.port
+    FROM port_events AS cur
+    WHERE cur.scan_id = ?
+    AND cur.state = 'open'
+    AND NOT EXISTS (
+        SELECT 1
+        FROM port_events AS other
+        WHERE other.scan_id = ?
+        AND other.state = 'open'
+        AND other.host = cur.host
+        AND other.port = cur.port
+    )
+"""
 
 
 class ChangeDetector:
@@ -13,37 +34,27 @@ class ChangeDetector:
     Compares scan results to detect attack surface changes.
     """
 
-    def __init__(self, db_path: str = "attack_surface.db") -> None:
-        self.db_path = db_path
+    def __init__(self, storage: Optional[StorageEngine] = None) -> None:
+        # Reuse the caller's engine (and its open connection) when given
+        self.storage = storage or StorageEngine()
 
-    def _get_ports_for_scan(self, scan_id: int) -> Set[Tuple[str, int]]:
-        """
-        Retrieve (host, port) pairs for a given scan.
-        """
-        with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.cursor()
-            cursor.execute(
-                """
-                SELECT host, port
-                FROM port_events
-                WHERE scan_id = ?
-                AND state = 'open'
-                """,
-                (scan_id,),
-            )
-            return set(cursor.fetchall())
-
-    def detect_changes(self, old_scan_id: int, new_scan_id: int) -> Dict[str, Set[Tuple[str, int]]]:
+    def detect_changes(self, old_scan_id: int, new_scan_id: int) -> Dict[str, FrozenSet[Tuple[str, int]]]:
         """
         Compare two scans and detect changes.
 
+        The set difference is computed by SQLite rather than by
+        materializing both scans in Python.
+
         Returns:
             Dict with keys: 'opened_ports', 'closed_ports'
         """
-        old_ports = self._get_ports_for_scan(old_scan_id)
-        new_ports = self._get_ports_for_scan(new_scan_id)
+        conn = self.storage.connection
+
+        # Build the sets straight from the cursor iterator (no fetchall list)
+        opened_ports = frozenset(conn.execute(_SQL_OPEN_PORTS_NOT_IN, (new_scan_id, old_scan_id)))
+        closed_ports = frozenset(conn.execute(_SQL_OPEN_PORTS_NOT_IN, (old_scan_id, new_scan_id)))
 
         return {
-            "opened_ports": new_ports - old_ports,
-            "closed_ports": old_ports - new_ports,
+            "opened_ports": opened_ports,
+            "closed_ports": closed_ports,
         }
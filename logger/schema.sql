@@ -24,6 +24,7 @@ CREATE TABLE IF NOT EXISTS scans (
     status TEXT DEFAULT 'completed',  -- 'completed', 'failed', 'partial'
     error_message TEXT,
     duration_seconds REAL,
+    port_fingerprint TEXT,  -- Hash of the sorted open (host, port) set
     FOREIGN KEY (target_id) REFERENCES targets(id)
 );
 
@@ -46,7 +47,7 @@ CREATE TABLE IF NOT EXISTS port_events (
     service TEXT,
     product TEXT,
     version TEXT,
-    timestamp TEXT NOT NULL,
+    timestamp INTEGER NOT NULL,  -- Unix epoch seconds (UTC)
     FOREIGN KEY (scan_id) REFERENCES scans(id)
 );
 
@@ -56,8 +57,8 @@ CREATE TABLE IF NOT EXISTS port_history (
     host TEXT NOT NULL,
     port INTEGER NOT NULL,
     protocol TEXT NOT NULL,
-    first_seen TEXT NOT NULL,
-    last_seen TEXT NOT NULL,
+    first_seen INTEGER NOT NULL,  -- Unix epoch seconds (UTC)
+    last_seen INTEGER NOT NULL,
     seen_count INTEGER DEFAULT 1,
     current_state TEXT NOT NULL,
     UNIQUE(host, port, protocol)
@@ -75,6 +76,8 @@ CREATE TABLE IF NOT EXISTS scan_metadata (
 -- Create indexes for better query performance
 CREATE INDEX IF NOT EXISTS idx_port_events_scan_host ON port_events(scan_id, host);
 CREATE INDEX IF NOT EXISTS idx_port_events_state ON port_events(state);
+-- Covering index so change detection over open ports is index-only
+CREATE INDEX IF NOT EXISTS idx_port_events_scan_state ON port_events(scan_id, state, host, port);
 CREATE INDEX IF NOT EXISTS idx_scans_timestamp ON scans(timestamp);
 CREATE INDEX IF NOT EXISTS idx_scans_target ON scans(target_address);
 CREATE INDEX IF NOT EXISTS idx_port_history_host_port ON port_history(host, port);
\ No newline at end of file
@@ -4,15 +4,185 @@ storage.py
 Enhanced persistent storage engine with better error handling and new features.
 """
 
+import calendar
+import hashlib
+import importlib.resources as ir
 import sqlite3
+from contextlib import contextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import Iterable, Iterator, List, Optional, Dict, Any, Tuple, Union
 from datetime import datetime
 
-from parser.events import SecurityEvent, HostDiscoveredEvent, PortStateEvent
+from parser.events import SecurityEvent, HostDiscoveredEvent, PortStateEvent, ParsedScan
 from utils import app_logger, config
 
 
+# SQL statements, kept as module constants so sqlite3's statement cache
+# (keyed by the SQL text) stays hot across calls
+_SQL_INSERT_SCAN = """
+    INSERT INTO scans (
+        target_id, target_address, profile, timestamp,
+        status, error_message, duration_seconds, port_fingerprint
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_UPDATE_SCAN_FINGERPRINT = "UPDATE scans SET port_fingerprint = ? WHERE id = ?"
+
+_SQL_INSERT_HOST = """
+    INSERT INTO hosts (scan_id, host)
+    VALUES (?, ?)
+"""
+
+_SQL_INSERT_PORT_EVENT = """
+    INSERT INTO port_events (
+        scan_id, host, port, protocol, state,
+        service, product, version, timestamp
+    )
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_UPSERT_HISTORY = """
+    INSERT INTO port_history (
+        host, port, protocol, first_seen,
+        last_seen, seen_count, current_state
+    )
+    VALUES (?, ?, ?, ?, ?, 1, ?)
+    ON CONFLICT(host, port, protocol) DO UPDATE SET
+        last_seen = excluded.last_seen,
+        seen_count = seen_count + 1,
+        current_state = excluded.current_state
+"""
+
+_SQL_SELECT_LAST_SCAN = """
+    SELECT * FROM scans
+    WHERE target_address = ? AND status = 'completed'
+    ORDER BY timestamp DESC
+    LIMIT 1
+"""
+
+_SQL_SELECT_PREVIOUS_SCAN = """
+    SELECT * FROM scans
+    WHERE target_address = ? AND status = 'completed' AND id < ?
+    ORDER BY id DESC
+    LIMIT 1
+"""
+
+_SQL_SELECT_SCAN = "SELECT * FROM scans WHERE id = ?"
+
+_SQL_SELECT_PORT_HISTORY = """
+    SELECT * FROM port_history
+    WHERE host = ? AND port = ? AND protocol = ?
+"""
+
+_SQL_CREATE_HISTORY_KEYS = """
+    CREATE TEMP TABLE IF NOT EXISTS history_keys (
+        host TEXT NOT NULL,
+        port INTEGER NOT NULL,
+        protocol TEXT NOT NULL
+    )
+"""
+
+_SQL_CLEAR_HISTORY_KEYS = "DELETE FROM temp.history_keys"
+
+_SQL_INSERT_HISTORY_KEY = """
+    INSERT INTO temp.history_keys (host, port, protocol)
+    VALUES (?, ?, ?)
+"""
+
+_SQL_SELECT_PORT_HISTORIES = """
+    SELECT h.*
+    FROM port_history AS h
+    JOIN temp.history_keys AS k USING (host, port, protocol)
+"""
+
+_SQL_PROBE_SCHEMA = "SELECT name FROM sqlite_master WHERE type = 'table' AND name = 'scans'"
+
+# Columns added after the first release, applied to existing databases
+_SCAN_COLUMN_MIGRATIONS = {
+    "port_fingerprint": "ALTER TABLE scans ADD COLUMN port_fingerprint TEXT",
+}
+
+# PRAGMA user_version of a database whose port_events/port_history
+# timestamps are INTEGER epoch seconds (older databases stored ISO text)
+_EPOCH_TIMESTAMPS_VERSION = 1
+
+# PRAGMA user_version of a database matching schema.sql; bump it whenever
+# the script gains a table or index so existing databases re-run it
+_SCHEMA_VERSION = 2
+
+
+def _epoch_sql(column: str) -> str:
+    """SQL converting an ISO-8601 text column to epoch seconds (unparseable values kept)."""
+    return f"COALESCE(CAST(strftime('%s', {column}) AS INTEGER), {column})"
+
+
+# The columns were declared TEXT, whose affinity turns stored integers back
+# into text, so both tables are rebuilt from schema.sql: the old tables are
+# set aside (with the index names the schema reuses dropped), recreated,
+# refilled with converted timestamps and then dropped
+_TIMESTAMP_MIGRATION_PREFIX = """
+    ALTER TABLE port_events RENAME TO port_events_v0;
+    ALTER TABLE port_history RENAME TO port_history_v0;
+    DROP INDEX IF EXISTS idx_port_events_scan_host;
+    DROP INDEX IF EXISTS idx_port_events_state;
+    DROP INDEX IF EXISTS idx_port_events_scan_state;
+    DROP INDEX IF EXISTS idx_port_history_host_port;
+"""
+
+_TIMESTAMP_MIGRATION_SUFFIX = f"""
+    INSERT INTO port_events (
+        id, scan_id, host, port, protocol, state,
+        service, product, version, timestamp
+    )
+    SELECT
+        id, scan_id, host, port, protocol, state,
+        service, product, version, {_epoch_sql("timestamp")}
+    FROM port_events_v0;
+    INSERT INTO port_history (
+        id, host, port, protocol, first_seen,
+        last_seen, seen_count, current_state
+    )
+    SELECT
+        id, host, port, protocol, {_epoch_sql("first_seen")},
+        {_epoch_sql("last_seen")}, seen_count, current_state
+    FROM port_history_v0;
+    DROP TABLE port_events_v0;
+    DROP TABLE port_history_v0;
+    PRAGMA user_version = {_EPOCH_TIMESTAMPS_VERSION};
+"""
+
+# Schema script shipped as package data, read once per process
+_SCHEMA_SQL = ir.files(__package__).joinpath("schema.sql").read_text(encoding="utf-8")
+
+
+# Database path for a transient, in-memory store (nothing touches disk)
+MEMORY_DATABASE = ":memory:"
+
+
+@lru_cache(maxsize=64)
+def _to_epoch(timestamp: datetime) -> int:
+    """
+    Convert an event timestamp to integer Unix seconds (naive values are UTC).
+
+    Events of one scan share a timestamp, so this is computed once per scan.
+    """
+    return calendar.timegm(timestamp.utctimetuple())
+
+
+def _port_fingerprint(port_rows: List[tuple]) -> str:
+    """
+    Hash the set of open (host, port) pairs in prepared port event rows.
+
+    Two scans with equal fingerprints have no opened or closed ports
+    between them, so change detection can skip the diff.
+    """
+    open_ports = sorted({(row[1], row[2]) for row in port_rows if row[4] == "open"})
+    payload = "\n".join(f"{host}:{port}" for host, port in open_ports)
+    return hashlib.blake2b(payload.encode(), digest_size=16).hexdigest()
+
+
 class StorageEngine:
     """
     SQLite-backed storage engine for scan results and security events.
@@ -23,22 +193,84 @@ class StorageEngine:
             db_path = config.get("paths.database", "attack_surface.db")
         
         self.db_path = Path(db_path)
+        self.ephemeral = str(db_path) == MEMORY_DATABASE
         self.logger = app_logger
+        self._conn = self._connect()
         self._initialize_database()
 
+        # Single cursor reused by every method (rows come back as sqlite3.Row)
+        self._cursor = self._conn.cursor()
+        self._cursor.row_factory = sqlite3.Row
+
+        # Per-instance memoization of point lookups; cleared on writes
+        self._port_history_cached = lru_cache(maxsize=4096)(self._query_port_history)
+        self._scan_cached = lru_cache(maxsize=256)(self._query_scan)
+
+    def _connect(self) -> sqlite3.Connection:
+        """
+        Open the long-lived connection shared by every method.
+
+        Autocommit mode is used; writes open explicit transactions.
+        """
+        conn = sqlite3.connect(
+            self.db_path,
+            isolation_level=None,
+            check_same_thread=False,
+            cached_statements=256,
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA mmap_size=268435456")
+        conn.execute("PRAGMA cache_size=-65536")
+        return conn
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """The shared SQLite connection (for read-only helpers like ChangeDetector)."""
+        return self._conn
+
+    def close(self) -> None:
+        """Close the underlying database connection."""
+        self._conn.close()
+
+    @contextmanager
+    def _write_transaction(self) -> Iterator[sqlite3.Cursor]:
+        """Run the enclosed writes in one BEGIN IMMEDIATE/COMMIT transaction."""
+        cursor = self._cursor
+        cursor.execute("BEGIN IMMEDIATE")
+        try:
+            yield cursor
+        except BaseException:
+            cursor.execute("ROLLBACK")
+            raise
+        cursor.execute("COMMIT")
+
     def _initialize_database(self) -> None:
-        """Create database and tables if they do not exist."""
+        """
+        Create database and tables if they do not exist.
+
+        The schema script only runs when the database is older than
+        _SCHEMA_VERSION, so opening an up-to-date database skips parsing
+        it. Older databases are migrated, then the (idempotent) script adds
+        any tables and indexes introduced since.
+        """
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                schema_path = Path("logger/schema.sql")
-                
-                if not schema_path.exists():
-                    raise FileNotFoundError("Database schema file not found")
-                
-                with open(schema_path, "r", encoding="utf-8") as schema_file:
-                    conn.executescript(schema_file.read())
-                
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version >= _SCHEMA_VERSION:
+                return
+            
+            if self._conn.execute(_SQL_PROBE_SCHEMA).fetchone() is None:
+                self._conn.executescript(_SCHEMA_SQL)
+                self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
                 self.logger.info(f"Database initialized at {self.db_path}")
+                return
+            
+            self._migrate_scans_table()
+            self._migrate_timestamps()
+            self._conn.executescript(_SCHEMA_SQL)
+            self._conn.execute(f"PRAGMA user_version = {_SCHEMA_VERSION}")
+            self.logger.info(f"Database schema updated to version {_SCHEMA_VERSION}")
         
         except sqlite3.Error as e:
             self.logger.error(f"Database initialization failed: {e}")
@@ -47,6 +279,37 @@ class StorageEngine:
             self.logger.error(f"Unexpected error during database setup: {e}")
             raise
 
+    def _migrate_scans_table(self) -> None:
+        """Add scans columns missing from databases created by older versions."""
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(scans)")}
+        
+        for column, statement in _SCAN_COLUMN_MIGRATIONS.items():
+            if column not in columns:
+                self._conn.execute(statement)
+                self.logger.info(f"Database migrated: added scans.{column}")
+
+    def _migrate_timestamps(self) -> None:
+        """Convert ISO text port timestamps left by older versions to epoch seconds."""
+        version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+        if version >= _EPOCH_TIMESTAMPS_VERSION:
+            return
+        
+        # One script in one transaction, so the version is only bumped
+        # together with the rebuilt tables
+        try:
+            self._conn.executescript(
+                "BEGIN IMMEDIATE;"
+                + _TIMESTAMP_MIGRATION_PREFIX
+                + _SCHEMA_SQL
+                + _TIMESTAMP_MIGRATION_SUFFIX
+                + "COMMIT;"
+            )
+        except BaseException:
+            if self._conn.in_transaction:
+                self._conn.execute("ROLLBACK")
+            raise
+        self.logger.info("Database migrated: port timestamps converted to epoch seconds")
+
     def create_scan(
         self, 
         target: str, 
@@ -73,74 +336,48 @@ class StorageEngine:
         timestamp = datetime.utcnow().isoformat()
 
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-                cursor.execute(
-                    """
-                    INSERT INTO scans (
-                        target_id, target_address, profile, 
-                        timestamp, status, error_message, duration_seconds
-                    )
-                    VALUES (?, ?, ?, ?, ?, ?, ?)
-                    """,
-                    (target_id, target, profile, timestamp, status, error_message, duration),
-                )
-                scan_id = cursor.lastrowid
-                
-                self.logger.info(f"Scan record created: ID={scan_id}, target={target}")
-                return scan_id
+            cursor = self._cursor
+            cursor.execute(
+                _SQL_INSERT_SCAN,
+                (target_id, target, profile, timestamp, status, error_message, duration, None),
+            )
+            scan_id = cursor.lastrowid
+            # A lookup of this ID may have cached "not found"
+            self._scan_cached.cache_clear()
+            
+            self.logger.info(f"Scan record created: ID={scan_id}, target={target}")
+            return scan_id
         
         except sqlite3.Error as e:
             self.logger.error(f"Failed to create scan record: {e}")
             raise
 
-    def store_events(self, scan_id: int, events: List[SecurityEvent]) -> None:
+    def store_events(
+        self,
+        scan_id: int,
+        events: Union[ParsedScan, List[SecurityEvent]]
+    ) -> None:
         """
         Persist security events associated with a scan.
         Also updates port history for tracking changes over time.
+        Accepts a ParsedScan (already split by type) or a plain event list.
+
+        Rows are written with one executemany per table inside a single
+        transaction; port history is maintained with an UPSERT.
         """
+        rows = self._event_rows(scan_id, events)
+
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                cursor = conn.cursor()
-
-                for event in events:
-                    if isinstance(event, HostDiscoveredEvent):
-                        cursor.execute(
-                            """
-                            INSERT INTO hosts (scan_id, host)
-                            VALUES (?, ?)
-                            """,
-                            (scan_id, event.host),
-                        )
-
-                    elif isinstance(event, PortStateEvent):
-                        # Store port event
-                        cursor.execute(
-                            """
-                            INSERT INTO port_events (
-                                scan_id, host, port, protocol, state,
-                                service, product, version, timestamp
-                            )
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            """,
-                            (
-                                scan_id,
-                                event.host,
-                                event.port,
-                                event.protocol,
-                                event.state,
-                                event.service,
-                                event.product,
-                                event.version,
-                                event.timestamp.isoformat(),
-                            ),
-                        )
-                        
-                        # Update port history
-                        if event.state == "open":
-                            self._update_port_history(cursor, event)
-                
-                self.logger.info(f"Stored {len(events)} events for scan {scan_id}")
+            with self._write_transaction() as cursor:
+                self._insert_event_rows(cursor, *rows)
+                cursor.execute(
+                    _SQL_UPDATE_SCAN_FINGERPRINT,
+                    (_port_fingerprint(rows[1]), scan_id),
+                )
+
+            self._scan_cached.cache_clear()
+            self._port_history_cached.cache_clear()
+            self.logger.info(f"Stored {len(events)} events for scan {scan_id}")
         
         except sqlite3.Error as e:
             self.logger.error(f"Failed to store events: {e}")
@@ -149,106 +386,244 @@ class StorageEngine:
             self.logger.error(f"Unexpected error while storing events: {e}")
             raise
 
-    def _update_port_history(self, cursor: sqlite3.Cursor, event: PortStateEvent) -> None:
-        """Update the port history table with current port state."""
-        timestamp = event.timestamp.isoformat()
-        
-        # Check if this port already exists in history
-        cursor.execute(
-            """
-            SELECT id, seen_count FROM port_history
-            WHERE host = ? AND port = ? AND protocol = ?
-            """,
-            (event.host, event.port, event.protocol),
-        )
+    def record_scan(
+        self,
+        target: str,
+        profile: str,
+        events: Union[ParsedScan, List[SecurityEvent]],
+        target_id: Optional[int] = None,
+        duration: Optional[float] = None
+    ) -> int:
+        """
+        Insert a completed scan and its events in one transaction.
+
+        Equivalent to create_scan() followed by store_events(), but the
+        scan row, events and port history are committed together (one
+        journal sync instead of two, and no scan row without its events).
         
-        result = cursor.fetchone()
+        Args:
+            target: IP address or hostname being scanned
+            profile: Scan profile used (fast, full, stealth)
+            events: Parsed security events for the scan (ParsedScan or list)
+            target_id: Optional reference to targets table
+            duration: Scan duration in seconds
         
-        if result:
-            # Update existing record
-            port_id, seen_count = result
-            cursor.execute(
-                """
-                UPDATE port_history
-                SET last_seen = ?, seen_count = ?, current_state = ?
-                WHERE id = ?
-                """,
-                (timestamp, seen_count + 1, event.state, port_id),
+        Returns:
+            Scan ID
+        """
+        timestamp = datetime.utcnow().isoformat()
+
+        try:
+            with self._write_transaction() as cursor:
+                cursor.execute(
+                    _SQL_INSERT_SCAN,
+                    (target_id, target, profile, timestamp, "completed", None, duration, None),
+                )
+                scan_id = cursor.lastrowid
+                rows = self._event_rows(scan_id, events)
+                self._insert_event_rows(cursor, *rows)
+                cursor.execute(
+                    _SQL_UPDATE_SCAN_FINGERPRINT,
+                    (_port_fingerprint(rows[1]), scan_id),
+                )
+
+            self._scan_cached.cache_clear()
+            self._port_history_cached.cache_clear()
+            self.logger.info(
+                f"Scan record created: ID={scan_id}, target={target} "
+                f"({len(events)} events)"
             )
+            return scan_id
+        
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to record scan: {e}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Unexpected error while recording scan: {e}")
+            raise
+
+    def _event_rows(
+        self,
+        scan_id: int,
+        events: Union[ParsedScan, List[SecurityEvent]]
+    ) -> Tuple[List[tuple], List[tuple], List[tuple]]:
+        """Build the host, port event and port history rows for a scan."""
+        if isinstance(events, ParsedScan):
+            host_events, port_events = events.host_events, events.port_events
         else:
-            # Insert new record
-            cursor.execute(
-                """
-                INSERT INTO port_history (
-                    host, port, protocol, first_seen, 
-                    last_seen, seen_count, current_state
-                )
-                VALUES (?, ?, ?, ?, ?, ?, ?)
-                """,
-                (
-                    event.host, event.port, event.protocol,
-                    timestamp, timestamp, 1, event.state
-                ),
+            host_events, port_events = self._split_events(events)
+        host_rows = [(scan_id, event.host) for event in host_events]
+        port_rows = [
+            (
+                scan_id,
+                event.host,
+                event.port,
+                event.protocol,
+                event.state,
+                event.service,
+                event.product,
+                event.version,
+                _to_epoch(event.timestamp),
             )
+            for event in port_events
+        ]
+        # port_rows[i][8] is the epoch timestamp, reused for first/last seen
+        history_rows = [
+            (row[1], row[2], row[3], row[8], row[8], row[4])
+            for row in port_rows
+            if row[4] == "open"
+        ]
+        return host_rows, port_rows, history_rows
+
+    @staticmethod
+    def _insert_event_rows(
+        cursor: sqlite3.Cursor,
+        host_rows: List[tuple],
+        port_rows: List[tuple],
+        history_rows: List[tuple]
+    ) -> None:
+        """Write prepared event rows (caller owns the transaction)."""
+        cursor.executemany(_SQL_INSERT_HOST, host_rows)
+        cursor.executemany(_SQL_INSERT_PORT_EVENT, port_rows)
+        cursor.executemany(_SQL_UPSERT_HISTORY, history_rows)
+
+    @staticmethod
+    def _split_events(
+        events: List[SecurityEvent]
+    ) -> Tuple[List[HostDiscoveredEvent], List[PortStateEvent]]:
+        """
+        Bucket events by type in a single pass.
+
+        Dispatch is keyed on the exact event type (one dict lookup);
+        subclasses fall back to isinstance checks.
+        """
+        host_events: List[HostDiscoveredEvent] = []
+        port_events: List[PortStateEvent] = []
+        appenders = {
+            HostDiscoveredEvent: host_events.append,
+            PortStateEvent: port_events.append,
+        }
+
+        for event in events:
+            append = appenders.get(type(event))
+            if append is None:
+                if isinstance(event, HostDiscoveredEvent):
+                    append = host_events.append
+                elif isinstance(event, PortStateEvent):
+                    append = port_events.append
+                else:
+                    continue
+            append(event)
+
+        return host_events, port_events
 
     def get_last_scan(self, target: str) -> Optional[Dict[str, Any]]:
-        """Get the most recent scan for a given target."""
+        """
+        Get the most recent scan for a given target.
+
+        Ephemeral (in-memory) stores keep no history, so this is always None.
+        """
+        if self.ephemeral:
+            return None
+        
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                cursor.execute(
-                    """
-                    SELECT * FROM scans
-                    WHERE target_address = ? AND status = 'completed'
-                    ORDER BY timestamp DESC
-                    LIMIT 1
-                    """,
-                    (target,),
-                )
-                
-                row = cursor.fetchone()
-                return dict(row) if row else None
+            cursor = self._cursor
+            cursor.execute(_SQL_SELECT_LAST_SCAN, (target,))
+            
+            row = cursor.fetchone()
+            return dict(row) if row else None
         
         except sqlite3.Error as e:
             self.logger.error(f"Failed to retrieve last scan: {e}")
             return None
 
+    def get_previous_scan(self, target: str, scan_id: int) -> Optional[Dict[str, Any]]:
+        """
+        Get the most recent completed scan of a target recorded before scan_id.
+
+        Ephemeral (in-memory) stores keep no history, so this is always None.
+        """
+        if self.ephemeral:
+            return None
+        
+        try:
+            cursor = self._cursor
+            cursor.execute(_SQL_SELECT_PREVIOUS_SCAN, (target, scan_id))
+            
+            row = cursor.fetchone()
+            return dict(row) if row else None
+        
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to retrieve previous scan: {e}")
+            return None
+
     def get_scan_by_id(self, scan_id: int) -> Optional[Dict[str, Any]]:
-        """Retrieve scan details by ID."""
+        """Retrieve scan details by ID (cached; scan rows are not modified)."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                cursor.execute("SELECT * FROM scans WHERE id = ?", (scan_id,))
-                row = cursor.fetchone()
-                
-                return dict(row) if row else None
+            row = self._scan_cached(scan_id)
+            return dict(row) if row else None
         
         except sqlite3.Error as e:
             self.logger.error(f"Failed to retrieve scan {scan_id}: {e}")
             return None
 
+    def _query_scan(self, scan_id: int) -> Optional[Dict[str, Any]]:
+        """Fetch a scan row from the database."""
+        cursor = self._cursor
+        cursor.execute(_SQL_SELECT_SCAN, (scan_id,))
+        row = cursor.fetchone()
+        
+        return dict(row) if row else None
+
     def get_port_history(self, host: str, port: int, protocol: str = "tcp") -> Optional[Dict[str, Any]]:
-        """Get historical information about a specific port."""
+        """Get historical information about a specific port (cached until the next store)."""
         try:
-            with sqlite3.connect(self.db_path) as conn:
-                conn.row_factory = sqlite3.Row
-                cursor = conn.cursor()
-                
-                cursor.execute(
-                    """
-                    SELECT * FROM port_history
-                    WHERE host = ? AND port = ? AND protocol = ?
-                    """,
-                    (host, port, protocol),
-                )
-                
-                row = cursor.fetchone()
-                return dict(row) if row else None
+            row = self._port_history_cached(host, port, protocol)
+            return dict(row) if row else None
         
         except sqlite3.Error as e:
             self.logger.error(f"Failed to retrieve port history: {e}")
-            return None
\ No newline at end of file
+            return None
+
+    def _query_port_history(self, host: str, port: int, protocol: str) -> Optional[Dict[str, Any]]:
+        """Fetch a port history row from the database."""
+        cursor = self._cursor
+        cursor.execute(_SQL_SELECT_PORT_HISTORY, (host, port, protocol))
+        
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
+    def get_port_histories(
+        self,
+        keys: Iterable[Tuple[str, int, str]]
+    ) -> Dict[Tuple[str, int, str], Dict[str, Any]]:
+        """
+        Get historical information for many ports with a single query.
+        
+        Args:
+            keys: (host, port, protocol) tuples to look up
+        
+        Returns:
+            Dict mapping (host, port, protocol) to port history data;
+            ports without history are omitted
+        """
+        # Duplicate keys would only multiply joined rows
+        keys = list(dict.fromkeys(keys))
+        if not keys:
+            return {}
+        
+        try:
+            cursor = self._cursor
+            cursor.execute(_SQL_CREATE_HISTORY_KEYS)
+            cursor.execute(_SQL_CLEAR_HISTORY_KEYS)
+            cursor.executemany(_SQL_INSERT_HISTORY_KEY, keys)
+            cursor.execute(_SQL_SELECT_PORT_HISTORIES)
+            
+            return {
+                (row["host"], row["port"], row["protocol"]): dict(row)
+                for row in cursor
+            }
+        
+        except sqlite3.Error as e:
+            self.logger.error(f"Failed to retrieve port histories: {e}")
+            return {}
@@ -6,20 +6,28 @@ Enhanced orchestrator with PDF reports, progress bars, colors, and improved risk
 
 import argparse
 import json
+import os
 import sys
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict
+from operator import attrgetter
 from pathlib import Path
 from datetime import datetime, timezone
 
-from tabulate import tabulate
 from colorama import Fore, Style
 
+try:
+    import orjson
+except ImportError:  # Optional: fall back to the stdlib encoder
+    orjson = None
+
 from scanner.runner import NmapRunner, ScanResult
 from parser.xml_parser import NmapXMLParser, ParseError
-from logger.storage import StorageEngine
+from logger.storage import MEMORY_DATABASE, StorageEngine
 from analyzer.diff import ChangeDetector
 from analyzer.risk import RiskScorer
-from parser.events import PortStateEvent
-from report_generators import PDFReportGenerator
 from utils import app_logger, config
 
 
@@ -36,6 +44,7 @@ Examples:
   %(prog)s -t 10.0.0.0/24 -p stealth --dry-run  # Preview stealth scan command
   %(prog)s --list-profiles                    # Show available scan profiles
   %(prog)s --rate-limit 100                   # Limit to 100 packets/sec
+  %(prog)s -t 10.0.0.0/24 --workers 4         # Scan four /26 subnets in parallel
         """
     )
     
@@ -85,6 +94,26 @@ Examples:
         help="Limit scan rate (packets per second)"
     )
     
+    parser.add_argument(
+        "--ephemeral",
+        action="store_true",
+        help="Use an in-memory database (nothing persisted; implied by --dry-run)"
+    )
+    
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Split a CIDR target into subnets scanned by up to N parallel Nmap processes"
+    )
+    
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=50,
+        help="Show only the N highest-risk findings in the table (0 = all, default: 50)"
+    )
+    
     parser.add_argument(
         "--verbose", "-v",
         action="store_true",
@@ -100,6 +129,10 @@ Examples:
     return parser
 
 
+# Built once at import; main() may be invoked repeatedly (scheduler, tests)
+_PARSER = setup_argument_parser()
+
+
 def print_header(title: str, quiet: bool = False) -> None:
     """Print a formatted section header with color."""
     if not quiet:
@@ -135,10 +168,30 @@ def handle_scan_result(scan_result: ScanResult, quiet: bool = False) -> bool:
     return True
 
 
+def write_json_report(report: dict, path: Path) -> None:
+    """
+    Serialize the report to JSON (orjson when available).
+
+    The report is written to a hidden temp file and moved into place with
+    os.replace, so an interrupted write never leaves a truncated report.
+    """
+    tmp_path = path.with_name(f".{path.name}.tmp")
+    try:
+        if orjson is not None:
+            with open(tmp_path, "wb") as f:
+                f.write(orjson.dumps(report, option=orjson.OPT_INDENT_2 | orjson.OPT_NAIVE_UTC))
+        else:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2)
+        
+        os.replace(tmp_path, path)
+    finally:
+        tmp_path.unlink(missing_ok=True)
+
+
 def main() -> int:
     """Main execution function."""
-    parser = setup_argument_parser()
-    args = parser.parse_args()
+    args = _PARSER.parse_args()
     
     # Handle --list-profiles
     if args.list_profiles:
@@ -161,16 +214,25 @@ def main() -> int:
         
         runner = NmapRunner(rate_limit=args.rate_limit)
         parser_obj = NmapXMLParser()
-        storage = StorageEngine()
-        
-        # Execute scan
-        print_header("Attack Surface Scan Started", quiet)
+        # Dry runs never store anything, so they skip the on-disk database
+        ephemeral = args.ephemeral or args.dry_run
         
-        scan_result = runner.run_scan(
-            target=args.target,
-            profile=args.profile,
-            dry_run=args.dry_run,
-        )
+        # Open the database and build the scorer while Nmap runs
+        with ThreadPoolExecutor(max_workers=1) as init_pool:
+            storage_future = init_pool.submit(
+                StorageEngine, MEMORY_DATABASE if ephemeral else None
+            )
+            scorer_future = init_pool.submit(RiskScorer)
+            
+            # Execute scan
+            print_header("Attack Surface Scan Started", quiet)
+            
+            scan_result = runner.run_parallel_scan(
+                target=args.target,
+                profile=args.profile,
+                workers=args.workers,
+                dry_run=args.dry_run,
+            )
         
         if not handle_scan_result(scan_result, quiet):
             return 1
@@ -178,6 +240,9 @@ def main() -> int:
         if scan_result.dry_run:
             return 0
         
+        storage = storage_future.result()
+        scorer = scorer_future.result()
+        
         # Parse XML output
         app_logger.info("Parsing scan results...")
         
@@ -193,12 +258,13 @@ def main() -> int:
         app_logger.info("Storing scan results...")
         
         try:
-            scan_id = storage.create_scan(
+            # Scan row and events are committed in a single transaction
+            scan_id = storage.record_scan(
                 target=args.target,
                 profile=args.profile,
+                events=events,
                 duration=scan_result.duration
             )
-            storage.store_events(scan_id, events)
         except Exception as e:
             app_logger.error(f"Failed to store scan results: {e}")
             if not quiet:
@@ -215,10 +281,18 @@ def main() -> int:
         changes = {"opened_ports": [], "closed_ports": []}
         
         try:
-            last_scan = storage.get_last_scan(args.target)
+            last_scan = storage.get_previous_scan(args.target, scan_id)
+            current_scan = storage.get_scan_by_id(scan_id) if last_scan else None
             
-            if last_scan and last_scan["id"] != scan_id:
-                detector = ChangeDetector()
+            if (
+                last_scan
+                and last_scan.get("port_fingerprint")
+                and last_scan["port_fingerprint"] == current_scan["port_fingerprint"]
+            ):
+                # Same open port set as last time: nothing opened or closed
+                app_logger.info(f"Open ports unchanged since scan {last_scan['id']}")
+            elif last_scan:
+                detector = ChangeDetector(storage)
                 diff = detector.detect_changes(last_scan["id"], scan_id)
                 changes = {
                     "opened_ports": list(diff["opened_ports"]),
@@ -233,27 +307,31 @@ def main() -> int:
             if not quiet:
                 print("No changes detected since last scan.")
         else:
+            # Build each listing and write it in one call
             if changes["opened_ports"] and not quiet:
-                print(f"{Fore.GREEN}Newly Opened Ports:{Style.RESET_ALL}")
-                for host, port in changes["opened_ports"]:
-                    print(f"  {Fore.GREEN}[+]{Style.RESET_ALL} {host}:{port}")
+                sys.stdout.write("\n".join([
+                    f"{Fore.GREEN}Newly Opened Ports:{Style.RESET_ALL}",
+                    *(f"  {Fore.GREEN}[+]{Style.RESET_ALL} {host}:{port}"
+                      for host, port in changes["opened_ports"]),
+                ]) + "\n")
             
             if changes["closed_ports"] and not quiet:
-                print(f"\n{Fore.YELLOW}Recently Closed Ports:{Style.RESET_ALL}")
-                for host, port in changes["closed_ports"]:
-                    print(f"  {Fore.YELLOW}[-]{Style.RESET_ALL} {host}:{port}")
+                sys.stdout.write("\n".join([
+                    f"\n{Fore.YELLOW}Recently Closed Ports:{Style.RESET_ALL}",
+                    *(f"  {Fore.YELLOW}[-]{Style.RESET_ALL} {host}:{port}"
+                      for host, port in changes["closed_ports"]),
+                ]) + "\n")
         
         # Enhanced risk scoring with context
-        scorer = RiskScorer()
-        port_events = [e for e in events if isinstance(e, PortStateEvent)]
+        port_events = events.port_events
         
-        # Get port histories for context
-        port_histories = {}
-        for event in port_events:
-            history = storage.get_port_history(event.host, event.port, event.protocol)
-            if history:
-                key = (event.host, event.port, event.protocol)
-                port_histories[key] = history
+        # Get port histories for context (one bulk query; only open ports
+        # are scored, so only their histories are needed)
+        port_histories = storage.get_port_histories(
+            (event.host, event.port, event.protocol)
+            for event in port_events
+            if event.state == "open"
+        )
         
         # Score with context
         risks = scorer.score_events(port_events, port_histories)
@@ -264,10 +342,16 @@ def main() -> int:
             if not quiet:
                 print("No risky services detected.")
         elif not quiet:
+            # Only needed when a table is printed
+            from tabulate import tabulate
+            
+            # risks is already sorted highest first, so the top rows are a slice
+            shown = risks[:args.top] if args.top > 0 else risks
+            
             # Color code by risk level
             table_data = []
-            for r in risks:
-                risk_val = r["risk"]
+            for r in shown:
+                risk_val = r.risk
                 if risk_val >= 8:
                     risk_str = f"{Fore.RED}{risk_val}/10{Style.RESET_ALL}"
                 elif risk_val >= 5:
@@ -276,9 +360,9 @@ def main() -> int:
                     risk_str = f"{Fore.GREEN}{risk_val}/10{Style.RESET_ALL}"
                 
                 table_data.append([
-                    r["host"],
-                    r["port"],
-                    r["service"],
+                    r.host,
+                    r.port,
+                    r.service,
                     risk_str
                 ])
             
@@ -288,43 +372,65 @@ def main() -> int:
                 tablefmt="grid",
             ))
             
-            # Show risk factors for high-risk items
-            high_risks = [r for r in risks if r["risk"] >= 8]
+            if len(shown) < len(risks):
+                print(f"(showing top {len(shown)} of {len(risks)}; see the report for all)")
+            
+            # Show risk factors for high-risk items (top 3 of the sorted list)
+            high_risks = [r for r in risks[:3] if r.risk >= 8]
             if high_risks:
-                print(f"\n{Fore.RED}High Risk Details:{Style.RESET_ALL}")
-                for r in high_risks[:3]:  # Show top 3
-                    print(f"\n  {Fore.YELLOW}Port {r['port']} ({r['service']}):{Style.RESET_ALL}")
-                    for factor in r.get('risk_factors', []):
-                        print(f"    • {factor}")
+                lines = [f"\n{Fore.RED}High Risk Details:{Style.RESET_ALL}"]
+                for r in high_risks:
+                    lines.append(f"\n  {Fore.YELLOW}Port {r.port} ({r.service}):{Style.RESET_ALL}")
+                    lines.extend(f"    • {factor}" for factor in r.risk_factors)
+                sys.stdout.write("\n".join(lines) + "\n")
         
         # Generate reports
         if not args.no_report:
+            # Tally port states (counted in C by Counter) and risk bands
+            state_counts = Counter(map(attrgetter("state"), port_events))
+            
+            high_risk_count = medium_risk_count = 0
+            for r in risks:
+                if r.risk >= 8:
+                    high_risk_count += 1
+                elif r.risk >= 5:
+                    medium_risk_count += 1
+            
+            # Reuse the scan-wide UTC timestamp taken by the parser
+            report_timestamp = (events.timestamp or datetime.now(timezone.utc)).isoformat()
+            
             report = {
                 "scan_id": scan_id,
                 "target": args.target,
                 "profile": args.profile,
-                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "timestamp": report_timestamp,
                 "duration_seconds": scan_result.duration,
                 "summary": {
                     "total_events": len(events),
-                    "open_ports": len([e for e in port_events if e.state == "open"]),
-                    "closed_ports": len([e for e in port_events if e.state == "closed"]),
-                    "filtered_ports": len([e for e in port_events if e.state == "filtered"]),
-                    "high_risk_findings": len([r for r in risks if r["risk"] >= 8]),
-                    "medium_risk_findings": len([r for r in risks if 5 <= r["risk"] < 8]),
+                    "open_ports": state_counts["open"],
+                    "closed_ports": state_counts["closed"],
+                    "filtered_ports": state_counts["filtered"],
+                    "high_risk_findings": high_risk_count,
+                    "medium_risk_findings": medium_risk_count,
                 },
                 "changes": changes,
-                "risk_assessment": risks,
+                "risk_assessment": [asdict(r) for r in risks],
             }
             
             reports_dir = Path(config.get("paths.reports_dir", "reports"))
             reports_dir.mkdir(exist_ok=True)
             
+            # An in-memory database restarts row IDs at 1 every run, so
+            # ephemeral reports get a unique name instead of the scan ID
+            if ephemeral:
+                report_name = f"report_ephemeral_{time.time_ns()}"
+            else:
+                report_name = f"report_scan_{scan_id}"
+            
             # JSON report
-            json_path = reports_dir / f"report_scan_{scan_id}.json"
+            json_path = reports_dir / f"{report_name}.json"
             try:
-                with open(json_path, "w", encoding="utf-8") as f:
-                    json.dump(report, f, indent=4)
+                write_json_report(report, json_path)
                 
                 print_header("Reports Generated", quiet)
                 if not quiet:
@@ -336,8 +442,11 @@ def main() -> int:
             
             # PDF report (if enabled)
             if config.get("reports.generate_pdf") and not args.no_pdf:
-                pdf_path = reports_dir / f"report_scan_{scan_id}.pdf"
+                pdf_path = reports_dir / f"{report_name}.pdf"
                 try:
+                    # ReportLab is heavy; import it only when a PDF is wanted
+                    from report_generators import PDFReportGenerator
+                    
                     pdf_gen = PDFReportGenerator()
                     if pdf_gen.generate(report, str(pdf_path)):
                         if not quiet:
@@ -6,12 +6,13 @@ Events represent meaningful security-relevant observations,
 not raw scan data.
 """
 
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Optional
+from itertools import chain
+from typing import Iterator, List, Optional
 
 
-@dataclass
+@dataclass(slots=True)
 class SecurityEvent:
     """
     Base class for all security events.
@@ -21,7 +22,7 @@ class SecurityEvent:
     timestamp: datetime
 
 
-@dataclass
+@dataclass(slots=True)
 class HostDiscoveredEvent(SecurityEvent):
     """
     Emitted when a live host is discovered.
@@ -29,7 +30,7 @@ class HostDiscoveredEvent(SecurityEvent):
     latency_ms: Optional[float] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PortStateEvent(SecurityEvent):
     """
     Emitted when a port is found in a specific state.
@@ -40,3 +41,23 @@ class PortStateEvent(SecurityEvent):
     service: Optional[str] = None
     product: Optional[str] = None
     version: Optional[str] = None
+
+
+@dataclass(slots=True)
+class ParsedScan:
+    """
+    Events extracted from one scan, already separated by type.
+
+    Iterating yields every event (hosts first, then ports), so it can be
+    used wherever a list of SecurityEvent is expected. ``timestamp`` is
+    the timezone-aware (UTC) time shared by every event of the scan.
+    """
+    host_events: List[HostDiscoveredEvent] = field(default_factory=list)
+    port_events: List[PortStateEvent] = field(default_factory=list)
+    timestamp: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self.host_events) + len(self.port_events)
+
+    def __iter__(self) -> Iterator[SecurityEvent]:
+        return chain(self.host_events, self.port_events)
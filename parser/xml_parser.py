@@ -4,184 +4,313 @@ xml_parser.py
 Enhanced Nmap XML parser with better error handling and validation.
 """
 
-from datetime import datetime
+import gc
+import sys
+from datetime import datetime, timezone
 from pathlib import Path
-from typing import List
+from typing import Dict, Iterator, List, Optional
 
 from lxml import etree
 
 from parser.events import (
-    SecurityEvent,
     HostDiscoveredEvent,
+    ParsedScan,
     PortStateEvent,
 )
 from utils import app_logger
 
 
+# Canonical copies of the small protocol/state vocabulary: lxml returns a
+# fresh str per attribute read, so repeated values are mapped onto one
+# shared (interned) object each
+_INTERNED_VALUES = {
+    value: sys.intern(value)
+    for value in (
+        "tcp", "udp", "sctp",
+        "open", "closed", "filtered", "unfiltered",
+        "open|filtered", "closed|filtered", "unknown",
+    )
+}
+
+# libxml2 options for Nmap output: no DTD loading, entity expansion or
+# network access (XXE hardening, and work the parser never needs), no ID
+# map, and comments/processing instructions (the xml-stylesheet line)
+# dropped before they reach the target
+_PARSER_OPTIONS = dict(
+    resolve_entities=False,
+    no_network=True,
+    load_dtd=False,
+    collect_ids=False,
+    huge_tree=False,
+    remove_comments=True,
+    remove_pis=True,
+)
+
+
+def hardened_parser(**kwargs) -> etree.XMLParser:
+    """
+    Create an lxml parser with the hardened options used for Nmap XML.
+
+    Any Nmap output read by the project goes through one of these, so
+    untrusted files never see entity expansion or network access.
+    Extra keyword arguments (e.g. target=) are passed to XMLParser.
+    """
+    return etree.XMLParser(**_PARSER_OPTIONS, **kwargs)
+
+
 class ParseError(Exception):
     """Raised when XML parsing fails."""
     pass
 
 
-class NmapXMLParser:
-    """
-    Parses Nmap XML output files and converts findings into structured security events.
+class NmapTargetHandler:
     """
+    lxml parser target that builds events directly from start/end callbacks.
 
-    def __init__(self):
-        self.logger = app_logger
+    libxml2 calls start()/end() as tags open and close, so no Element
+    objects are created. Only the attributes the parser needs are kept
+    until the enclosing <host> closes, at which point its events are
+    emitted. Element depth is tracked so that only direct children are
+    considered (e.g. the address inside <hosthint> is ignored).
+    """
 
-    def parse(self, xml_path: str) -> List[SecurityEvent]:
-        """
-        Parse an Nmap XML file and extract security events.
+    def __init__(self, timestamp: datetime, logger) -> None:
+        self.timestamp = timestamp
+        self.logger = logger
+        self.events = ParsedScan(timestamp=timestamp)
+        self.hosts_found = 0
+        # Scan-scoped string table: the same service/product/version text
+        # repeats across many ports, so events share one object per value
+        # (dropped with the handler, unlike sys.intern)
+        self._strings: Dict[str, str] = {}
 
-        Args:
-            xml_path (str): Path to Nmap XML output file.
+        self._depth = 0
+        self._in_host = False
+        self._in_ports = False
+        self._reset_host()
 
-        Returns:
-            List[SecurityEvent]: List of extracted security events.
-        
-        Raises:
-            FileNotFoundError: If XML file doesn't exist
-            ParseError: If XML is malformed or invalid
-        """
-        xml_file = Path(xml_path)
+    def _reset_host(self) -> None:
+        """Clear the attributes collected for the current host."""
+        self._has_address = False
+        self._host_ip: Optional[str] = None
+        self._srtt: Optional[str] = None
+        # [port attrib, state attrib, service attrib] per <port>
+        self._ports: List[list] = []
+        self._port: Optional[list] = None
 
-        if not xml_file.exists():
-            error_msg = f"XML file not found: {xml_path}"
-            self.logger.error(error_msg)
-            raise FileNotFoundError(error_msg)
+    def start(self, tag: str, attrib: Dict[str, str]) -> None:
+        depth = self._depth
+        self._depth = depth + 1
 
-        try:
-            self.logger.info(f"Parsing XML file: {xml_file.name}")
-            tree = etree.parse(str(xml_file))
-            root = tree.getroot()
-            
+        if depth == 0:
             # Validate that this is an Nmap XML file
-            if root.tag != "nmaprun":
+            if tag != "nmaprun":
                 raise ParseError("Invalid Nmap XML file: missing nmaprun root element")
-            
-            events = self._extract_events(root)
-            
-            self.logger.info(f"Successfully parsed {len(events)} events from {xml_file.name}")
-            return events
-        
-        except etree.XMLSyntaxError as e:
-            error_msg = f"XML syntax error: {e}"
-            self.logger.error(error_msg)
-            raise ParseError(error_msg)
-        
-        except Exception as e:
-            error_msg = f"Unexpected error during parsing: {e}"
-            self.logger.error(error_msg, exc_info=True)
-            raise ParseError(error_msg)
+        elif depth == 1:
+            if tag == "host":
+                self._in_host = True
+                self._reset_host()
+        elif not self._in_host:
+            return
+        elif depth == 2:
+            if tag == "address":
+                if not self._has_address:
+                    self._has_address = True
+                    self._host_ip = attrib.get("addr")
+            elif tag == "times":
+                if self._srtt is None:
+                    self._srtt = attrib.get("srtt", "0")
+            elif tag == "ports":
+                self._in_ports = True
+        elif depth == 3:
+            if self._in_ports and tag == "port":
+                self._port = [attrib, None, None]
+        elif depth == 4 and self._port is not None:
+            if tag == "state":
+                if self._port[1] is None:
+                    self._port[1] = attrib
+            elif tag == "service":
+                if self._port[2] is None:
+                    self._port[2] = attrib
 
-    def _extract_events(self, root: etree.Element) -> List[SecurityEvent]:
-        """Extract security events from parsed XML root element."""
-        events: List[SecurityEvent] = []
-        timestamp = datetime.utcnow()
+    def end(self, tag: str) -> None:
+        self._depth -= 1
+        depth = self._depth
 
-        hosts_found = root.findall("host")
-        self.logger.debug(f"Found {len(hosts_found)} hosts in scan results")
+        if not self._in_host:
+            return
+        if depth == 1:
+            self._in_host = False
+            self._finish_host()
+        elif depth == 2 and tag == "ports":
+            self._in_ports = False
+        elif depth == 3 and self._port is not None:
+            self._ports.append(self._port)
+            self._port = None
 
-        for host in hosts_found:
-            try:
-                host_events = self._parse_host(host, timestamp)
-                events.extend(host_events)
-            except Exception as e:
-                # Log error but continue parsing other hosts
-                self.logger.warning(f"Error parsing host: {e}")
-                continue
+    def close(self) -> ParsedScan:
+        return self.events
 
-        return events
+    def _finish_host(self) -> None:
+        """Emit the events for the host that just closed."""
+        self.hosts_found += 1
+        try:
+            self._emit_host()
+        except Exception as e:
+            # Log error but continue parsing other hosts
+            self.logger.warning(f"Error parsing host: {e}")
 
-    def _parse_host(self, host: etree.Element, timestamp: datetime) -> List[SecurityEvent]:
-        """Parse a single host element and extract events."""
-        events: List[SecurityEvent] = []
-        
-        # Extract IP address
-        address_elem = host.find("address")
-        if address_elem is None:
+    def _emit_host(self) -> None:
+        """Build the host discovery event and its port events."""
+        if not self._has_address:
             self.logger.warning("Host missing address element, skipping")
-            return events
+            return
 
-        host_ip = address_elem.get("addr")
+        host_ip = self._host_ip
         if not host_ip:
             self.logger.warning("Host address is empty, skipping")
-            return events
+            return
 
         # Host discovery event with latency information
-        latency_elem = host.find("times")
         latency = None
-        if latency_elem is not None:
+        if self._srtt is not None:
             try:
-                srtt = latency_elem.get("srtt", "0")
-                latency = float(srtt) / 1000  # Convert to milliseconds
+                latency = float(self._srtt) / 1000  # Convert to milliseconds
             except (ValueError, TypeError):
                 self.logger.debug(f"Could not parse latency for {host_ip}")
 
-        events.append(
-            HostDiscoveredEvent(
-                event_type="host_discovered",
-                host=host_ip,
-                timestamp=timestamp,
-                latency_ms=latency,
-            )
+        host_event = HostDiscoveredEvent(
+            event_type="host_discovered",
+            host=host_ip,
+            timestamp=self.timestamp,
+            latency_ms=latency,
         )
 
         # Parse port information
-        ports_elem = host.find("ports")
-        if ports_elem is None:
+        if not self._ports:
             self.logger.debug(f"No ports found for host {host_ip}")
-            return events
 
-        for port in ports_elem.findall("port"):
+        self.events.host_events.append(host_event)
+        # Streamed straight into the scan's list (no per-host list)
+        self.events.port_events.extend(self._iter_port_events(host_ip))
+
+    def _iter_port_events(self, host_ip: str) -> Iterator[PortStateEvent]:
+        """Yield the port events of the current host, skipping bad ports."""
+        build_port = self._build_port
+        for port_attrib, state_attrib, service_attrib in self._ports:
             try:
-                port_event = self._parse_port(port, host_ip, timestamp)
-                if port_event:
-                    events.append(port_event)
+                yield build_port(port_attrib, state_attrib, service_attrib, host_ip)
             except Exception as e:
                 self.logger.warning(f"Error parsing port for {host_ip}: {e}")
                 continue
 
-        return events
+    def _shared(self, value: Optional[str]) -> Optional[str]:
+        """Return the scan-wide shared copy of a string value."""
+        if value is None:
+            return None
+        return self._strings.setdefault(value, value)
 
-    def _parse_port(
-        self, 
-        port: etree.Element, 
-        host_ip: str, 
-        timestamp: datetime
+    def _build_port(
+        self,
+        port_attrib: Dict[str, str],
+        state_attrib: Optional[Dict[str, str]],
+        service_attrib: Optional[Dict[str, str]],
+        host_ip: str
     ) -> PortStateEvent:
-        """Parse a single port element."""
+        """Build a port event from the collected element attributes."""
         try:
-            port_id = int(port.get("portid"))
-            protocol = port.get("protocol", "tcp")
+            port_id = int(port_attrib.get("portid"))
         except (ValueError, TypeError) as e:
             raise ParseError(f"Invalid port ID: {e}")
 
-        state_elem = port.find("state")
-        if state_elem is None:
+        interned = _INTERNED_VALUES
+        protocol = port_attrib.get("protocol", "tcp")
+        protocol = interned.get(protocol) or self._shared(protocol)
+
+        if state_attrib is None:
             raise ParseError("Port missing state element")
 
-        state = state_elem.get("state", "unknown")
+        state = state_attrib.get("state", "unknown")
+        state = interned.get(state) or self._shared(state)
 
         # Extract service information
-        service_elem = port.find("service")
         service = product = version = None
 
-        if service_elem is not None:
-            service = service_elem.get("name")
-            product = service_elem.get("product")
-            version = service_elem.get("version")
+        if service_attrib is not None:
+            shared = self._shared
+            service = shared(service_attrib.get("name"))
+            product = shared(service_attrib.get("product"))
+            version = shared(service_attrib.get("version"))
 
         return PortStateEvent(
             event_type="port_state",
             host=host_ip,
-            timestamp=timestamp,
+            timestamp=self.timestamp,
             port=port_id,
             protocol=protocol,
             state=state,
             service=service,
             product=product,
             version=version,
-        )
\ No newline at end of file
+        )
+
+
+class NmapXMLParser:
+    """
+    Parses Nmap XML output files and converts findings into structured security events.
+    """
+
+    def __init__(self):
+        self.logger = app_logger
+
+    def parse(self, xml_path: str) -> ParsedScan:
+        """
+        Parse an Nmap XML file and extract security events.
+
+        Args:
+            xml_path (str): Path to Nmap XML output file.
+
+        Returns:
+            ParsedScan: Extracted security events, grouped by type.
+
+        Raises:
+            FileNotFoundError: If XML file doesn't exist
+            ParseError: If XML is malformed or invalid
+        """
+        xml_file = Path(xml_path)
+
+        if not xml_file.exists():
+            error_msg = f"XML file not found: {xml_path}"
+            self.logger.error(error_msg)
+            raise FileNotFoundError(error_msg)
+
+        try:
+            self.logger.info(f"Parsing XML file: {xml_file.name}")
+            # One scan-wide, timezone-aware timestamp shared by every event
+            handler = NmapTargetHandler(datetime.now(timezone.utc), self.logger)
+            xml_parser = hardened_parser(target=handler)
+
+            # Events hold no reference cycles, so pause the cyclic GC while
+            # hundreds of thousands of them are allocated
+            gc_was_enabled = gc.isenabled()
+            gc.disable()
+            try:
+                # With a target, parse() returns handler.close() (no tree)
+                events = etree.parse(str(xml_file), xml_parser)
+            finally:
+                if gc_was_enabled:
+                    gc.enable()
+
+            self.logger.debug(f"Found {handler.hosts_found} hosts in scan results")
+            self.logger.info(f"Successfully parsed {len(events)} events from {xml_file.name}")
+            return events
+
+        except etree.XMLSyntaxError as e:
+            error_msg = f"XML syntax error: {e}"
+            self.logger.error(error_msg)
+            raise ParseError(error_msg)
+
+        except Exception as e:
+            error_msg = f"Unexpected error during parsing: {e}"
+            self.logger.error(error_msg, exc_info=True)
+            raise ParseError(error_msg)
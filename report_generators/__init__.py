@@ -4,6 +4,13 @@ report_generators package
 Report generation utilities (PDF, CSV, etc.)
 """
 
-from report_generators.pdf_generator import PDFReportGenerator
+__all__ = ["PDFReportGenerator"]
 
-__all__ = ["PDFReportGenerator"]
\ No newline at end of file
+
+def __getattr__(name):
+    # reportlab is a heavy import: load the PDF generator on first access
+    # (PEP 562) so importing this package stays cheap
+    if name == "PDFReportGenerator":
+        from report_generators.pdf_generator import PDFReportGenerator
+        return PDFReportGenerator
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
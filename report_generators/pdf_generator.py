@@ -4,66 +4,169 @@ pdf_generator.py
 Generates professional PDF reports from scan results.
 """
 
-from pathlib import Path
+from bisect import bisect_left
+from operator import itemgetter
 from datetime import datetime
 from typing import Dict, List, Any
+from xml.sax.saxutils import escape
 
 from reportlab.lib import colors
-from reportlab.lib.pagesizes import letter, A4
+from reportlab.lib.pagesizes import letter
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import inch
 from reportlab.platypus import (
-    SimpleDocTemplate, Table, TableStyle, Paragraph, 
-    Spacer, PageBreak, Image
+    SimpleDocTemplate, Table, LongTable, TableStyle, Paragraph, 
+    Spacer, PageBreak
 )
-from reportlab.lib.enums import TA_CENTER, TA_LEFT
+from reportlab.lib.enums import TA_CENTER
 
 from utils import app_logger
 
 
+# Report palette (parsed once per process instead of per table/row)
+_COLOR_DARK = colors.HexColor('#2C3E50')
+_COLOR_SLATE = colors.HexColor('#34495E')
+_COLOR_RED = colors.HexColor('#E74C3C')
+_COLOR_BLUE = colors.HexColor('#3498DB')
+_COLOR_ROW_ALT = colors.HexColor('#ECF0F1')
+_COLOR_GRID = colors.HexColor('#BDC3C7')
+_COLOR_HIGH_BG = colors.HexColor('#FADBD8')
+_COLOR_MEDIUM_BG = colors.HexColor('#FCF3CF')
+_COLOR_LOW_BG = colors.HexColor('#D5F4E6')
+
+# Risk tables longer than this are laid out page by page with LongTable
+_LONG_TABLE_ROWS = 200
+
+# Risk scores are integers in 0-10, so their cell labels are shared
+_RISK_LABELS = tuple(f"{i}/10" for i in range(11))
+
+# Host/service cells longer than this are wrapped in a Paragraph; shorter
+# ones stay plain strings, which reportlab draws without text layout
+_WRAP_CELL_CHARS = 20
+
+# Table styles are read-only command lists, so one instance per table
+# shape is shared by every report
+_TITLE_TABLE_STYLE = TableStyle([
+    ('FONT', (0, 0), (-1, -1), 'Helvetica', 11),
+    ('FONT', (0, 0), (0, -1), 'Helvetica-Bold', 11),
+    ('TEXTCOLOR', (0, 0), (0, -1), _COLOR_DARK),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, _COLOR_ROW_ALT]),
+    ('BOX', (0, 0), (-1, -1), 1, _COLOR_GRID),
+    ('GRID', (0, 0), (-1, -1), 0.5, _COLOR_GRID),
+])
+
+_SUMMARY_TABLE_STYLE = TableStyle([
+    ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold', 12),
+    ('FONT', (0, 1), (-1, -1), 'Helvetica', 11),
+    ('BACKGROUND', (0, 0), (-1, 0), _COLOR_BLUE),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('ALIGN', (1, 0), (1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, _COLOR_ROW_ALT]),
+    ('BOX', (0, 0), (-1, -1), 1, _COLOR_DARK),
+    ('GRID', (0, 0), (-1, -1), 0.5, _COLOR_GRID),
+])
+
+# Risk table header and grid; severity band colors are added per report
+_RISK_TABLE_STYLE = TableStyle([
+    ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold', 11),
+    ('FONT', (0, 1), (-1, -1), 'Helvetica', 10),
+    ('BACKGROUND', (0, 0), (-1, 0), _COLOR_RED),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
+    ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+    ('BOX', (0, 0), (-1, -1), 1, _COLOR_DARK),
+    ('GRID', (0, 0), (-1, -1), 0.5, _COLOR_GRID),
+])
+
+# Timestamp formats (scan time is UTC; the footer uses local time)
+_TS_FMT = '%Y-%m-%d %H:%M:%S UTC'
+_FOOTER_TS_FMT = '%Y-%m-%d %H:%M:%S'
+_FOOTER_TMPL = "<i>Report generated by AttackSurfaceX on {}</i>"
+
+# Fixed security recommendations listed in every report
+_RECOMMENDATIONS = (
+    "• Review and justify all high-risk services (FTP, Telnet, PPTP)",
+    "• Ensure all services are running latest patched versions",
+    "• Implement firewall rules to restrict access to sensitive ports",
+    "• Consider disabling unused services to reduce attack surface",
+    "• Enable encryption for all remote access services",
+    "• Implement network segmentation where applicable",
+    "• Schedule regular security scans to track changes",
+)
+
+
+def _format_timestamp(value: str) -> str:
+    """Format an ISO-8601 scan timestamp (as written by datetime.isoformat)."""
+    return datetime.fromisoformat(value).strftime(_TS_FMT)
+
+
 class PDFReportGenerator:
     """
     Generates professional PDF reports from scan data.
     """
     
+    # Stylesheet shared by every instance, built on first use
+    _STYLES = None
+    
     def __init__(self):
         self.logger = app_logger
-        self.styles = getSampleStyleSheet()
-        self._setup_custom_styles()
+        self.styles = type(self)._get_styles()
     
-    def _setup_custom_styles(self):
+    @classmethod
+    def _get_styles(cls):
+        """Return the shared stylesheet, creating it on the first call."""
+        if cls._STYLES is None:
+            styles = getSampleStyleSheet()
+            cls._setup_custom_styles(styles)
+            cls._STYLES = styles
+        return cls._STYLES
+    
+    @staticmethod
+    def _setup_custom_styles(styles):
         """Create custom paragraph styles."""
         # Title style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CustomTitle',
-            parent=self.styles['Heading1'],
+            parent=styles['Heading1'],
             fontSize=24,
-            textColor=colors.HexColor('#2C3E50'),
+            textColor=_COLOR_DARK,
             spaceAfter=30,
             alignment=TA_CENTER,
             fontName='Helvetica-Bold'
         ))
         
         # Subtitle style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='CustomSubtitle',
-            parent=self.styles['Heading2'],
+            parent=styles['Heading2'],
             fontSize=16,
-            textColor=colors.HexColor('#34495E'),
+            textColor=_COLOR_SLATE,
             spaceAfter=12,
             spaceBefore=12,
             fontName='Helvetica-Bold'
         ))
         
         # Risk header style
-        self.styles.add(ParagraphStyle(
+        styles.add(ParagraphStyle(
             name='RiskHeader',
-            parent=self.styles['Heading3'],
+            parent=styles['Heading3'],
             fontSize=14,
-            textColor=colors.HexColor('#E74C3C'),
+            textColor=_COLOR_RED,
             spaceAfter=10,
             fontName='Helvetica-Bold'
         ))
+        
+        # Wrapped risk table cell style (matches the table body font)
+        styles.add(ParagraphStyle(
+            name='RiskCell',
+            parent=styles['Normal'],
+            fontSize=10,
+            alignment=TA_CENTER,
+        ))
     
     def generate(self, report_data: Dict[str, Any], output_path: str) -> bool:
         """
@@ -132,21 +235,12 @@ class PDFReportGenerator:
             ['Scan ID:', str(data['scan_id'])],
             ['Target:', data['target']],
             ['Profile:', data['profile'].upper()],
-            ['Timestamp:', datetime.fromisoformat(data['timestamp'].replace('Z', '+00:00')).strftime('%Y-%m-%d %H:%M:%S UTC')],
+            ['Timestamp:', _format_timestamp(data['timestamp'])],
             ['Duration:', f"{data.get('duration_seconds', 0):.2f} seconds"],
         ]
         
         info_table = Table(scan_info, colWidths=[2*inch, 4*inch])
-        info_table.setStyle(TableStyle([
-            ('FONT', (0, 0), (-1, -1), 'Helvetica', 11),
-            ('FONT', (0, 0), (0, -1), 'Helvetica-Bold', 11),
-            ('TEXTCOLOR', (0, 0), (0, -1), colors.HexColor('#2C3E50')),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 0), (-1, -1), [colors.white, colors.HexColor('#ECF0F1')]),
-            ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#BDC3C7')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#BDC3C7')),
-        ]))
+        info_table.setStyle(_TITLE_TABLE_STYLE)
         
         elements.append(info_table)
         elements.append(PageBreak())
@@ -175,18 +269,7 @@ class PDFReportGenerator:
         ]
         
         stats_table = Table(stats, colWidths=[3*inch, 2*inch])
-        stats_table.setStyle(TableStyle([
-            ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold', 12),
-            ('FONT', (0, 1), (-1, -1), 'Helvetica', 11),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#3498DB')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('ALIGN', (1, 0), (1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, colors.HexColor('#ECF0F1')]),
-            ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#2C3E50')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#BDC3C7')),
-        ]))
+        stats_table.setStyle(_SUMMARY_TABLE_STYLE)
         
         elements.append(stats_table)
         elements.append(Spacer(1, 0.3*inch))
@@ -209,48 +292,51 @@ class PDFReportGenerator:
             elements.append(Spacer(1, 0.3*inch))
             return elements
         
-        # Sort by risk (highest first)
-        sorted_risks = sorted(risks, key=lambda x: x['risk'], reverse=True)
+        # Sort by risk (highest first); itemgetter keeps the key calls in C
+        sorted_risks = sorted(risks, key=itemgetter('risk'), reverse=True)
         
         # Build risk table
-        risk_data = [['Host', 'Port', 'Service', 'Risk Level']]
+        cell_style = self.styles['RiskCell']
+        
+        def cell(text: str):
+            if len(text) > _WRAP_CELL_CHARS:
+                return Paragraph(escape(text), cell_style)
+            return text
         
-        for risk in sorted_risks:
-            risk_level = f"{risk['risk']}/10"
-            risk_data.append([
-                risk['host'],
+        risk_data = [['Host', 'Port', 'Service', 'Risk Level']]
+        risk_data.extend(
+            [
+                cell(risk['host']),
                 str(risk['port']),
-                risk.get('service', 'unknown'),
-                risk_level
-            ])
-        
-        risk_table = Table(risk_data, colWidths=[2*inch, 1*inch, 1.5*inch, 1.5*inch])
-        
-        # Define table style
-        table_style = [
-            ('FONT', (0, 0), (-1, 0), 'Helvetica-Bold', 11),
-            ('FONT', (0, 1), (-1, -1), 'Helvetica', 10),
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#E74C3C')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.whitesmoke),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-            ('BOX', (0, 0), (-1, -1), 1, colors.HexColor('#2C3E50')),
-            ('GRID', (0, 0), (-1, -1), 0.5, colors.HexColor('#BDC3C7')),
-        ]
+                cell(risk.get('service', 'unknown')),
+                _RISK_LABELS[risk['risk']],
+            ]
+            for risk in sorted_risks
+        )
         
-        # Color code risks
-        for i, risk in enumerate(sorted_risks, start=1):
-            if risk['risk'] >= 8:
-                # High risk - red
-                table_style.append(('BACKGROUND', (0, i), (-1, i), colors.HexColor('#FADBD8')))
-            elif risk['risk'] >= 5:
-                # Medium risk - yellow
-                table_style.append(('BACKGROUND', (0, i), (-1, i), colors.HexColor('#FCF3CF')))
-            else:
-                # Low risk - green
-                table_style.append(('BACKGROUND', (0, i), (-1, i), colors.HexColor('#D5F4E6')))
-        
-        risk_table.setStyle(TableStyle(table_style))
+        # LongTable splits across pages without measuring the whole table
+        table_cls = LongTable if len(sorted_risks) > _LONG_TABLE_ROWS else Table
+        risk_table = table_cls(risk_data, colWidths=[2*inch, 1*inch, 1.5*inch, 1.5*inch])
+        
+        # Shared header/grid style; only the band colors below are per report
+        risk_table.setStyle(_RISK_TABLE_STYLE)
+        
+        # Color code risks: rows are sorted, so each severity band is one
+        # contiguous range (high - red, medium - yellow, low - green) whose
+        # boundaries are found by binary search over the negated scores
+        neg_scores = [-risk['risk'] for risk in sorted_risks]
+        high_count = bisect_left(neg_scores, -7)
+        medium_count = bisect_left(neg_scores, -4) - high_count
+        bands = (
+            (1, high_count, _COLOR_HIGH_BG),
+            (high_count + 1, high_count + medium_count, _COLOR_MEDIUM_BG),
+            (high_count + medium_count + 1, len(sorted_risks), _COLOR_LOW_BG),
+        )
+        risk_table.setStyle(TableStyle([
+            ('BACKGROUND', (0, first), (-1, last), color)
+            for first, last, color in bands
+            if first <= last
+        ]))
         elements.append(risk_table)
         elements.append(Spacer(1, 0.3*inch))
         
@@ -268,6 +354,7 @@ class PDFReportGenerator:
         
         opened = changes.get('opened_ports', [])
         closed = changes.get('closed_ports', [])
+        normal = self.styles['Normal']
         
         if not opened and not closed:
             no_changes = Paragraph("No changes detected since last scan.", 
@@ -282,9 +369,9 @@ class PDFReportGenerator:
                                     self.styles['RiskHeader'])
             elements.append(opened_title)
             
-            for host, port in opened:
-                port_text = Paragraph(f"• {host}:{port}", self.styles['Normal'])
-                elements.append(port_text)
+            elements.extend(
+                Paragraph(f"• {host}:{port}", normal) for host, port in opened
+            )
             
             elements.append(Spacer(1, 0.2*inch))
         
@@ -294,9 +381,9 @@ class PDFReportGenerator:
                                     self.styles['Normal'])
             elements.append(closed_title)
             
-            for host, port in closed:
-                port_text = Paragraph(f"• {host}:{port}", self.styles['Normal'])
-                elements.append(port_text)
+            elements.extend(
+                Paragraph(f"• {host}:{port}", normal) for host, port in closed
+            )
             
             elements.append(Spacer(1, 0.2*inch))
         
@@ -311,30 +398,20 @@ class PDFReportGenerator:
         elements.append(title)
         elements.append(Spacer(1, 0.2*inch))
         
-        # Recommendations
-        recommendations = [
-            "• Review and justify all high-risk services (FTP, Telnet, PPTP)",
-            "• Ensure all services are running latest patched versions",
-            "• Implement firewall rules to restrict access to sensitive ports",
-            "• Consider disabling unused services to reduce attack surface",
-            "• Enable encryption for all remote access services",
-            "• Implement network segmentation where applicable",
-            "• Schedule regular security scans to track changes",
-        ]
-        
         rec_title = Paragraph("Security Recommendations:", 
                              self.styles['Heading3'])
         elements.append(rec_title)
         
-        for rec in recommendations:
-            rec_para = Paragraph(rec, self.styles['Normal'])
-            elements.append(rec_para)
+        # Built per report: reportlab leaves layout state (e.g. _postponed)
+        # on flowables, so instances cannot be shared between builds
+        normal = self.styles['Normal']
+        elements.extend(Paragraph(rec, normal) for rec in _RECOMMENDATIONS)
         
         elements.append(Spacer(1, 0.3*inch))
         
         # Footer
         footer = Paragraph(
-            f"<i>Report generated by AttackSurfaceX on {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</i>",
+            _FOOTER_TMPL.format(datetime.now().strftime(_FOOTER_TS_FMT)),
             self.styles['Normal']
         )
         elements.append(footer)
@@ -5,41 +5,55 @@ Defines reusable Nmap scan profiles with metadata.
 Optimized for practical monitoring use cases.
 """
 
-from typing import Dict, List
+import sys
+from types import MappingProxyType
+from typing import Dict, Mapping, Tuple, Union
 
-SCAN_PROFILES: Dict[str, Dict[str, List[str]]] = {
+_PROFILE_DEFS: Dict[str, Dict[str, Union[str, Tuple[str, ...]]]] = {
     "fast": {
         "description": "Fast scan of top 100 TCP ports",
-        "flags": [
+        "flags": (
             "-T4",
             "--top-ports", "100",
-        ],
+        ),
     },
     "full": {
         "description": "Scan top 1000 ports with service detection",
-        "flags": [
+        "flags": (
             "-T4",                   
             "--top-ports", "1000",
             "-sV",                    
             "--version-intensity", "5", 
-        ],
+        ),
     },
     "comprehensive": {
         "description": "Deep scan - all ports with detailed service detection (SLOW)",
-        "flags": [
+        "flags": (
             "-p-",                
             "-sV",                   
             "-T3",                    
             "--version-intensity", "7", 
-        ],
+        ),
     },
     "stealth": {
         "description": "Low-noise SYN scan without host discovery",
-        "flags": [
+        "flags": (
             "-sS",
             "-Pn",
             "-T2",
             "--top-ports", "100",
-        ],
+        ),
     },
-}
\ No newline at end of file
+}
+
+
+# Read-only registry built from the definitions above: flag tuples hold
+# interned strings, and neither level can be mutated by callers, so the
+# flags can be splatted straight into an argv without a defensive copy
+SCAN_PROFILES: Mapping[str, Mapping[str, Union[str, Tuple[str, ...]]]] = MappingProxyType({
+    sys.intern(name): MappingProxyType({
+        "description": spec["description"],
+        "flags": tuple(sys.intern(flag) for flag in spec["flags"]),
+    })
+    for name, spec in _PROFILE_DEFS.items()
+})
@@ -6,25 +6,70 @@ Enhanced Nmap scan execution with progress bars, rate limiting, and better UX.
 
 from __future__ import annotations
 
+import asyncio
+import ipaddress
+import re
+import shlex
 import subprocess
+import sys
 import shutil
+import tempfile
 import time
 import threading
-from datetime import datetime, timezone
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 from dataclasses import dataclass
 
-from tqdm import tqdm
+from lxml import etree
 from colorama import Fore, Style, init as colorama_init
 
+from parser.xml_parser import hardened_parser
 from scanner.profiles import SCAN_PROFILES
 from utils import app_logger, config
 
+# Nmap progress reporting: interval for --stats-every and the estimate
+# it prints, e.g. "SYN Stealth Scan Timing: About 45.50% done; ETC: ..."
+_STATS_INTERVAL = "2s"
+_PROGRESS_RX = re.compile(r"About ([\d.]+)% done")
+
 # Initialize colorama for Windows compatibility
 colorama_init(autoreset=True)
 
 
+@lru_cache(maxsize=None)
+def _profiles() -> Dict[str, str]:
+    """Profile name -> description (profiles are static, built once)."""
+    return {
+        name: details["description"]
+        for name, details in SCAN_PROFILES.items()
+    }
+
+
+def _format_stamp(ns: int) -> str:
+    """Format a time.time_ns() value as a ScanResult timestamp (UTC)."""
+    return time.strftime("%Y%m%d_%H%M%S", time.gmtime(ns // 1_000_000_000))
+
+
+def _write_lines(lines: List[str]) -> None:
+    """Write a block of console lines with a single write and flush."""
+    sys.stdout.write("\n".join(lines) + "\n")
+    sys.stdout.flush()
+
+
+class _LazyJoin:
+    """Log argument that renders an argv only if the record is emitted."""
+    
+    __slots__ = ("argv",)
+    
+    def __init__(self, argv: Tuple[str, ...]) -> None:
+        self.argv = argv
+    
+    def __str__(self) -> str:
+        return shlex.join(self.argv)
+
+
 class NmapNotInstalledError(Exception):
     """Raised when Nmap is not found in system PATH."""
     pass
@@ -35,18 +80,32 @@ class ScanExecutionError(Exception):
     pass
 
 
-@dataclass
+@dataclass(slots=True, frozen=True)
 class ScanResult:
-    """Structured scan result with all relevant information."""
+    """
+    Structured scan result with all relevant information.
+    
+    ``command`` is the Nmap argv that was run. A merged parallel scan ran
+    several processes, so its ``command`` is empty and ``part_commands``
+    holds one argv per part.
+    """
     target: str
     profile: str
-    command: str
+    command: Tuple[str, ...]
     output_file: str
     timestamp: str
     success: bool
     duration: float
     error_message: Optional[str] = None
     dry_run: bool = False
+    part_commands: Tuple[Tuple[str, ...], ...] = ()
+    
+    @property
+    def command_str(self) -> str:
+        """The Nmap command line(s), shell-quoted and rendered on demand."""
+        if self.part_commands:
+            return "; ".join(shlex.join(argv) for argv in self.part_commands)
+        return shlex.join(self.command)
 
 
 class NmapRunner:
@@ -54,6 +113,9 @@ class NmapRunner:
     Executes Nmap scans with progress indication, rate limiting, and colorized output.
     """
     
+    # Absolute path of the nmap binary, looked up by the first runner
+    _NMAP_PATH: Optional[str] = None
+    
     def __init__(
         self, 
         output_dir: Optional[str] = None, 
@@ -64,6 +126,11 @@ class NmapRunner:
         self.output_dir = Path(output_dir or config.get("paths.scans_dir", "scans"))
         self.timeout = timeout or config.get("scan.timeout", 300)
         self.rate_limit = rate_limit or config.get("scan.rate_limit", None)
+        self.min_rate = config.get("scan.min_rate", None)
+        self.timing_template = config.get("scan.timing_template", None)
+        self.host_timeout = config.get("scan.host_timeout", None)
+        # Profile -> "nmap" + flags with rate/timing options, built on first use
+        self._argv: Dict[str, Tuple[str, ...]] = {}
         self.show_progress = show_progress
         self.logger = app_logger
         
@@ -81,7 +148,17 @@ class NmapRunner:
 
     def _verify_nmap_installation(self) -> None:
         """Verify that Nmap is installed and accessible."""
-        if shutil.which("nmap") is None:
+        # Resolved once per process: later runners skip the PATH walk and
+        # every scan runs the same binary
+        if NmapRunner._NMAP_PATH is None:
+            NmapRunner._NMAP_PATH = shutil.which("nmap")
+        
+        # Scans pass this absolute path as the executable together with
+        # close_fds=False, which lets CPython launch them via posix_spawn
+        # instead of fork/exec (Python-created fds are non-inheritable, so
+        # nothing extra leaks into Nmap)
+        self.nmap_path = NmapRunner._NMAP_PATH
+        if self.nmap_path is None:
             self.logger.error("Nmap executable not found in system PATH")
             raise NmapNotInstalledError(
                 "Nmap is not installed or not in PATH. "
@@ -90,39 +167,132 @@ class NmapRunner:
         
         self.logger.info(f"{Fore.GREEN}✓{Style.RESET_ALL} Nmap installation verified")
 
-    def _apply_rate_limiting(self, flags: List[str]) -> List[str]:
+    def _apply_rate_limiting(self, flags: Tuple[str, ...]) -> Tuple[str, ...]:
         """Apply rate limiting to Nmap flags if configured."""
         if self.rate_limit:
             # Add rate limiting flag
             # --max-rate limits packets per second
-            flags.append("--max-rate")
-            flags.append(str(self.rate_limit))
+            flags += ("--max-rate", str(self.rate_limit))
             
             self.logger.info(f"Rate limiting applied: {self.rate_limit} packets/sec")
         
         return flags
 
-    def _show_progress(self, duration: int, profile: str) -> None:
-        """Show a progress bar during scan execution."""
+    def _apply_timing(self, flags: Tuple[str, ...]) -> Tuple[str, ...]:
+        """
+        Apply rate limiting and the configured Nmap timing options.
+        
+        --min-rate, the -T template and --host-timeout come from the scan
+        config and are only added when the profile does not set them.
+        --min-rate dominates wall-clock time far more than parallelism
+        tuning, and --host-timeout stops one dead host stalling the scan.
+        """
+        flags = self._apply_rate_limiting(flags)
+        extra: List[str] = []
+        
+        if self.min_rate and "--min-rate" not in flags:
+            if self.rate_limit and self.min_rate > self.rate_limit:
+                self.logger.warning(
+                    f"Ignoring scan.min_rate={self.min_rate}: above rate limit {self.rate_limit}"
+                )
+            else:
+                extra += ("--min-rate", str(self.min_rate))
+        
+        if self.timing_template is not None and not any(
+            flag.startswith("-T") for flag in flags
+        ):
+            extra.append(f"-T{self.timing_template}")
+        
+        if self.host_timeout and "--host-timeout" not in flags:
+            extra += ("--host-timeout", str(self.host_timeout))
+        
+        if extra:
+            self.logger.debug(f"Timing options applied: {' '.join(extra)}")
+            flags += tuple(extra)
+        
+        return flags
+
+    def _run_with_progress(self, command: Tuple[str, ...], profile: str) -> None:
+        """
+        Run Nmap and drive a progress bar from its own completion estimates.
+        
+        Nmap is started with --stats-every and the "About X% done" lines it
+        prints to stdout advance the bar, so progress reflects real work.
+        stderr is spooled to a temporary file so neither pipe can fill up.
+        
+        Raises:
+            subprocess.TimeoutExpired: If the scan exceeds the timeout
+            subprocess.CalledProcessError: If Nmap exits with an error
+        """
+        # tqdm costs ~60ms to import and only interactive scans need it
+        from tqdm import tqdm
+        
+        command = [command[0], "--stats-every", _STATS_INTERVAL, *command[1:]]
         desc = f"{Fore.CYAN}Scanning ({profile}){Style.RESET_ALL}"
         
-        with tqdm(
-            total=duration,
+        with tempfile.TemporaryFile() as stderr_file, tqdm(
+            total=100,
             desc=desc,
-            unit="s",
-            bar_format="{l_bar}{bar}| {n_fmt}/{total_fmt}s [{elapsed}]",
+            unit="%",
+            bar_format="{l_bar}{bar}| {n:.1f}/{total_fmt}% [{elapsed}]",
             colour="cyan"
         ) as pbar:
-            start = time.time()
-            while time.time() - start < duration:
-                time.sleep(1)
-                pbar.update(1)
+            process = subprocess.Popen(
+                command,
+                executable=self.nmap_path,
+                stdout=subprocess.PIPE,
+                stderr=stderr_file,
+                text=True,
+                errors="replace",
+                bufsize=1,
+                close_fds=False,
+            )
+            # Enforce the timeout without polling: kill the scan when it fires
+            timed_out = threading.Event()
+            
+            def expire() -> None:
+                timed_out.set()
+                process.kill()
+            
+            timer = threading.Timer(self.timeout, expire)
+            timer.start()
+            try:
+                done = 0.0
+                for line in process.stdout:
+                    match = _PROGRESS_RX.search(line)
+                    if match:
+                        percent = min(float(match.group(1)), 100.0)
+                        if percent > done:
+                            pbar.update(percent - done)
+                            done = percent
+                returncode = process.wait()
+            except BaseException:
+                # Like subprocess.run: an interrupted read (Ctrl+C, a bar
+                # error) must not leave Nmap running and writing -oX
+                process.kill()
+                process.wait()
+                raise
+            finally:
+                timer.cancel()
+                process.stdout.close()
+            
+            if timed_out.is_set():
+                raise subprocess.TimeoutExpired(command, self.timeout)
+            
+            stderr_file.seek(0)
+            stderr = stderr_file.read().decode(errors="replace")
+            if returncode != 0:
+                raise subprocess.CalledProcessError(returncode, command, stderr=stderr)
+            
+            pbar.update(100 - done)
 
     def run_scan(
         self,
         target: str,
         profile: str,
         dry_run: bool = False,
+        output_file: Optional[Path] = None,
+        show_progress: Optional[bool] = None,
     ) -> ScanResult:
         """
         Execute an Nmap scan with progress indication and rate limiting.
@@ -131,48 +301,228 @@ class NmapRunner:
             target: IP address, hostname, or CIDR range to scan
             profile: Scan profile name (fast, full, comprehensive, stealth)
             dry_run: If True, only show command without executing
+            output_file: XML output path (default: timestamped file in output_dir)
+            show_progress: Override the runner's progress bar setting
+        
+        Returns:
+            ScanResult object with scan details and status
+        """
+        timestamp, output_file, command = self._prepare_scan(
+            target, profile, output_file
+        )
+        if show_progress is None:
+            show_progress = self.show_progress
+        
+        self.logger.info(f"Preparing scan: target={target}, profile={profile}")
+        self.logger.debug("Command: %s", _LazyJoin(command))
+        
+        # Pre-scan banner, written to the console in one go
+        lines = [
+            f"\n{Fore.CYAN}[i]{Style.RESET_ALL} Target: {Fore.YELLOW}{target}{Style.RESET_ALL}",
+            f"{Fore.CYAN}[i]{Style.RESET_ALL} Profile: {Fore.YELLOW}{profile}{Style.RESET_ALL}",
+        ]
+
+        # Dry run mode
+        if dry_run:
+            lines.append(f"{Fore.YELLOW}[!]{Style.RESET_ALL} Dry run mode - scan not executed")
+            lines.append(f"{Fore.CYAN}Command:{Style.RESET_ALL} {shlex.join(command)}")
+            _write_lines(lines)
+            self.logger.info("Dry run mode - scan not executed")
+            return ScanResult(
+                target=target,
+                profile=profile,
+                command=command,
+                output_file=str(output_file),
+                timestamp=timestamp,
+                success=True,
+                duration=0.0,
+                dry_run=True,
+            )
+
+        # Execute the scan
+        start_time = time.time()
+        error = None
+        
+        try:
+            lines.append(f"\n{Fore.CYAN}[→]{Style.RESET_ALL} Starting Nmap scan...")
+            _write_lines(lines)
+            self.logger.info(f"Starting Nmap scan of {target}...")
+            
+            if show_progress:
+                self._run_with_progress(command, profile)
+            else:
+                # The XML file is the scan output: discard Nmap's console
+                # output instead of buffering it, keep stderr for errors
+                subprocess.run(
+                    command,
+                    executable=self.nmap_path,
+                    stdout=subprocess.DEVNULL,
+                    stderr=subprocess.PIPE,
+                    timeout=self.timeout,
+                    check=True,
+                    text=True,
+                    errors="replace",
+                    close_fds=False,
+                )
+            # Nmap exits non-zero when it cannot write the -oX file, so a
+            # clean exit is trusted without stat-ing the output
+        except Exception as e:
+            error = e
+        
+        return self._finish_scan(
+            target, profile, command, output_file, timestamp, start_time,
+            error, console=True,
+        )
+
+    def _scan_error_message(self, error: Exception) -> str:
+        """Map an exception raised while running Nmap to a ScanResult error message."""
+        if isinstance(error, (subprocess.TimeoutExpired, asyncio.TimeoutError)):
+            return f"Scan timed out after {self.timeout} seconds"
+        if isinstance(error, subprocess.CalledProcessError):
+            return f"Nmap scan failed: {(error.stderr or '').strip() or 'Unknown error'}"
+        return f"Unexpected error during scan: {str(error)}"
+
+    def _finish_scan(
+        self,
+        target: str,
+        profile: str,
+        command: Tuple[str, ...],
+        output_file: Path,
+        timestamp: str,
+        start_time: float,
+        error: Optional[Exception] = None,
+        console: bool = False,
+    ) -> ScanResult:
+        """
+        Log the outcome of an executed scan and build its ScanResult.
+        
+        Args:
+            target: Target label recorded on the result
+            profile: Scan profile name
+            command: Nmap argv that was run
+            output_file: XML output path
+            timestamp: Scan timestamp
+            start_time: time.time() taken when the scan started
+            error: Exception raised by the scan, or None on success
+            console: Also print the outcome to the console
         
         Returns:
             ScanResult object with scan details and status
         """
+        duration = time.time() - start_time
+        error_msg = None
+        
+        if error is None:
+            if console:
+                print(f"\n{Fore.GREEN}✓{Style.RESET_ALL} Scan completed in {Fore.GREEN}{duration:.2f}s{Style.RESET_ALL}")
+            self.logger.info(f"Scan completed successfully in {duration:.2f}s: {output_file.name}")
+        else:
+            error_msg = self._scan_error_message(error)
+            if console:
+                print(f"\n{Fore.RED}✗{Style.RESET_ALL} {error_msg}")
+            # Only unexpected failures get a traceback
+            expected = (
+                subprocess.TimeoutExpired,
+                subprocess.CalledProcessError,
+                asyncio.TimeoutError,
+            )
+            self.logger.error(
+                error_msg, exc_info=None if isinstance(error, expected) else error
+            )
+        
+        return ScanResult(
+            target=target,
+            profile=profile,
+            command=command,
+            output_file=str(output_file),
+            timestamp=timestamp,
+            success=error is None,
+            duration=duration,
+            error_message=error_msg,
+        )
+
+    def _check_profile(self, profile: str) -> None:
+        """Raise ValueError (and log it) if the profile is unknown."""
         if profile not in SCAN_PROFILES:
             available = ", ".join(SCAN_PROFILES.keys())
             error_msg = f"Unknown scan profile '{profile}'. Available: {available}"
             self.logger.error(f"{Fore.RED}✗{Style.RESET_ALL} {error_msg}")
             raise ValueError(error_msg)
 
-        timestamp = datetime.now(timezone.utc).strftime("%Y%m%d_%H%M%S")
-        output_file = self.output_dir / f"scan_{timestamp}.xml"
+    def _prepare_scan(
+        self,
+        target: str,
+        profile: str,
+        output_file: Optional[Path] = None,
+    ) -> Tuple[str, Path, Tuple[str, ...]]:
+        """
+        Validate the profile and build the Nmap command for one scan.
         
-        # Get flags and apply rate limiting
-        flags: List[str] = SCAN_PROFILES[profile]["flags"].copy()
-        flags = self._apply_rate_limiting(flags)
+        Returns:
+            Tuple of (timestamp, output_file, command)
+        
+        Raises:
+            ValueError: If the profile is unknown
+        """
+        self._check_profile(profile)
 
-        command: List[str] = [
-            "nmap",
-            *flags,
-            "-oX",
-            str(output_file),
-            target,
-        ]
+        ns = time.time_ns()
+        timestamp = _format_stamp(ns)
+        if output_file is None:
+            # A plain path on purpose: Nmap opens the file itself, so a
+            # directory fd held here (e.g. /proc/self/fd/<n>/...) would
+            # resolve in Nmap's fd table, not ours, and still walk /proc
+            output_file = self.output_dir / f"scan_{ns}.xml"
+        
+        command = (*self._profile_argv(profile), "-oX", str(output_file), target)
+
+        return timestamp, output_file, command
+
+    def _profile_argv(self, profile: str) -> Tuple[str, ...]:
+        """Return the Nmap argv prefix for a profile (built once per runner)."""
+        argv = self._argv.get(profile)
+        if argv is None:
+            # Get flags and apply rate/timing options (profile flags are shared tuples)
+            argv = ("nmap", *self._apply_timing(SCAN_PROFILES[profile]["flags"]))
+            self._argv[profile] = argv
+        return argv
 
-        command_str = " ".join(command)
+    async def run_scan_async(
+        self,
+        target: str,
+        profile: str,
+        dry_run: bool = False,
+        output_file: Optional[Path] = None,
+    ) -> ScanResult:
+        """
+        Execute an Nmap scan without blocking a thread while it runs.
+        
+        The process is awaited on the event loop, so one thread can drive
+        many concurrent scans. Nothing is printed to the console; progress
+        and errors go to the log.
         
-        print(f"\n{Fore.CYAN}[i]{Style.RESET_ALL} Target: {Fore.YELLOW}{target}{Style.RESET_ALL}")
-        print(f"{Fore.CYAN}[i]{Style.RESET_ALL} Profile: {Fore.YELLOW}{profile}{Style.RESET_ALL}")
+        Args:
+            target: IP address, hostname, or CIDR range to scan
+            profile: Scan profile name (fast, full, comprehensive, stealth)
+            dry_run: If True, only build the command without executing
+            output_file: XML output path (default: timestamped file in output_dir)
+        
+        Returns:
+            ScanResult object with scan details and status
+        """
+        timestamp, output_file, command = self._prepare_scan(
+            target, profile, output_file
+        )
         
         self.logger.info(f"Preparing scan: target={target}, profile={profile}")
-        self.logger.debug(f"Command: {command_str}")
+        self.logger.debug("Command: %s", _LazyJoin(command))
 
-        # Dry run mode
         if dry_run:
-            print(f"{Fore.YELLOW}[!]{Style.RESET_ALL} Dry run mode - scan not executed")
-            print(f"{Fore.CYAN}Command:{Style.RESET_ALL} {command_str}")
             self.logger.info("Dry run mode - scan not executed")
             return ScanResult(
                 target=target,
                 profile=profile,
-                command=command_str,
+                command=command,
                 output_file=str(output_file),
                 timestamp=timestamp,
                 success=True,
@@ -180,105 +530,343 @@ class NmapRunner:
                 dry_run=True,
             )
 
-        # Execute the scan
         start_time = time.time()
+        error = None
+        
+        try:
+            self.logger.info(f"Starting Nmap scan of {target}...")
+            # The XML file is the scan output; only stderr is kept
+            process = await asyncio.create_subprocess_exec(
+                *command,
+                executable=self.nmap_path,
+                stdout=asyncio.subprocess.DEVNULL,
+                stderr=asyncio.subprocess.PIPE,
+                close_fds=False,
+            )
+            try:
+                _, stderr = await asyncio.wait_for(
+                    process.communicate(), timeout=self.timeout
+                )
+            except asyncio.TimeoutError:
+                process.kill()
+                await process.wait()
+                raise
+            if process.returncode != 0:
+                raise subprocess.CalledProcessError(
+                    process.returncode, command,
+                    stderr=stderr.decode(errors="replace"),
+                )
+        except Exception as e:
+            error = e
+        
+        return self._finish_scan(
+            target, profile, command, output_file, timestamp, start_time, error
+        )
+
+    def run_parallel_scan(
+        self,
+        target: str,
+        profile: str,
+        workers: int = 1,
+        dry_run: bool = False,
+    ) -> ScanResult:
+        """
+        Split a CIDR target into subnets and scan them concurrently.
+        
+        Each subnet runs in its own Nmap process; the XML outputs are merged
+        into a single file so the rest of the pipeline sees one scan.
+        Single-host targets, hostnames and workers <= 1 fall back to run_scan.
+        
+        Args:
+            target: IP address, hostname, or CIDR range to scan
+            profile: Scan profile name (fast, full, comprehensive, stealth)
+            workers: Maximum number of concurrent Nmap processes
+            dry_run: If True, only show commands without executing
+        
+        Returns:
+            ScanResult for the merged scan
+        """
+        subnets = self._split_target(target, workers)
+        if len(subnets) == 1:
+            return self.run_scan(target=target, profile=profile, dry_run=dry_run)
+
+        ns = time.time_ns()
+        timestamp = _format_stamp(ns)
+        output_file = self.output_dir / f"scan_{ns}.xml"
+        
+        self.logger.info(
+            f"Splitting {target} into {len(subnets)} subnets across {workers} workers"
+        )
+        
+        start_time = time.time()
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(
+                lambda item: self.run_scan(
+                    target=item[1],
+                    profile=profile,
+                    dry_run=dry_run,
+                    output_file=self.output_dir / f"scan_{ns}_part{item[0]}.xml",
+                    show_progress=False,
+                ),
+                enumerate(subnets),
+            ))
+        duration = time.time() - start_time
+        
+        failed = next((result for result in results if not result.success), None)
+        error_msg = failed.error_message if failed else None
+        
+        if failed is None and not dry_run:
+            try:
+                self._merge_outputs(results, output_file)
+            except ScanExecutionError as e:
+                error_msg = str(e)
+                self.logger.error(error_msg)
+        
+        if error_msg is None and not dry_run:
+            print(f"\n{Fore.GREEN}✓{Style.RESET_ALL} Parallel scan completed in {Fore.GREEN}{duration:.2f}s{Style.RESET_ALL}")
+            self.logger.info(f"Parallel scan completed in {duration:.2f}s: {output_file.name}")
+        
+        return ScanResult(
+            target=target,
+            profile=profile,
+            command=(),
+            output_file=str(output_file),
+            timestamp=timestamp,
+            success=error_msg is None,
+            duration=duration,
+            error_message=error_msg,
+            dry_run=dry_run,
+            part_commands=tuple(result.command for result in results),
+        )
+
+    async def run_scans_async(
+        self,
+        targets: List[str],
+        profile: str,
+        dry_run: bool = False,
+    ) -> List[ScanResult]:
+        """
+        Scan several targets concurrently on the running event loop.
+        
+        At most scan.parallel_jobs Nmap processes run at once.
+        
+        Args:
+            targets: IP addresses, hostnames, or CIDR ranges to scan
+            profile: Scan profile name (fast, full, comprehensive, stealth)
+            dry_run: If True, only build commands without executing
+        
+        Returns:
+            List of ScanResult objects, in the same order as targets
+        """
+        if not targets:
+            return []
+        
+        jobs = max(1, min(config.get("scan.parallel_jobs", 4), len(targets)))
+        limit = asyncio.Semaphore(jobs)
+        ns = time.time_ns()
+        
+        async def scan(index: int, target: str) -> ScanResult:
+            # One batch stamp plus the target index keeps output files distinct
+            output_file = self.output_dir / f"scan_{ns}_{index}.xml"
+            async with limit:
+                return await self.run_scan_async(
+                    target, profile, dry_run=dry_run, output_file=output_file
+                )
+        
+        self.logger.info(f"Scanning {len(targets)} targets with {jobs} parallel jobs")
+        return list(await asyncio.gather(*(
+            scan(index, target) for index, target in enumerate(targets)
+        )))
+
+    def run_scans(
+        self,
+        targets: List[str],
+        profile: str,
+        dry_run: bool = False,
+    ) -> List[ScanResult]:
+        """
+        Scan several targets concurrently, one Nmap process per target.
+        
+        Synchronous wrapper around run_scans_async: the processes are
+        awaited from a single thread instead of one blocked thread each.
+        
+        Args:
+            targets: IP addresses, hostnames, or CIDR ranges to scan
+            profile: Scan profile name (fast, full, comprehensive, stealth)
+            dry_run: If True, only build commands without executing
+        
+        Returns:
+            List of ScanResult objects, in the same order as targets
+        """
+        return asyncio.run(self.run_scans_async(targets, profile, dry_run=dry_run))
+
+    def run_scan_many(
+        self,
+        targets: List[str],
+        profile: str,
+        dry_run: bool = False,
+    ) -> ScanResult:
+        """
+        Scan several targets with a single Nmap process.
+        
+        The targets are fed to Nmap on stdin (-iL -), so its own scheduler
+        packs probes across the whole set instead of N independent
+        processes competing, and one XML file covers every target.
+        
+        Args:
+            targets: IP addresses, hostnames, or CIDR ranges to scan
+            profile: Scan profile name (fast, full, comprehensive, stealth)
+            dry_run: If True, only build the command without executing
+        
+        Returns:
+            ScanResult for the combined scan
+        """
+        self._check_profile(profile)
+        
+        ns = time.time_ns()
+        timestamp = _format_stamp(ns)
+        output_file = self.output_dir / f"scan_{ns}.xml"
+        command = (*self._profile_argv(profile), "-oX", str(output_file), "-iL", "-")
+        target_label = f"{len(targets)} hosts"
+        
+        self.logger.info(f"Preparing scan: target={target_label}, profile={profile}")
+        self.logger.debug("Command: %s", _LazyJoin(command))
         
-        # Start progress indicator in separate thread if enabled
-        progress_thread = None
-        if self.show_progress and not dry_run:
-            progress_thread = threading.Thread(
-                target=self._show_progress, 
-                args=(self.timeout, profile),
-                daemon=True
+        if dry_run:
+            self.logger.info("Dry run mode - scan not executed")
+            return ScanResult(
+                target=target_label,
+                profile=profile,
+                command=command,
+                output_file=str(output_file),
+                timestamp=timestamp,
+                success=True,
+                duration=0.0,
+                dry_run=True,
             )
-            progress_thread.start()
+        
+        start_time = time.time()
+        error = None
         
         try:
-            print(f"\n{Fore.CYAN}[→]{Style.RESET_ALL} Starting Nmap scan...")
-            self.logger.info(f"Starting Nmap scan of {target}...")
-            
-            result = subprocess.run(
+            self.logger.info(f"Starting Nmap scan of {target_label}...")
+            subprocess.run(
                 command,
-                stdout=subprocess.PIPE,
+                executable=self.nmap_path,
+                input="\n".join(targets) + "\n",
+                stdout=subprocess.DEVNULL,
                 stderr=subprocess.PIPE,
                 timeout=self.timeout,
                 check=True,
                 text=True,
+                errors="replace",
+                close_fds=False,
             )
+        except Exception as e:
+            error = e
+        
+        return self._finish_scan(
+            target_label, profile, command, output_file, timestamp, start_time, error
+        )
+
+    def _split_target(self, target: str, workers: int) -> List[str]:
+        """Split a CIDR target into up to the next power of two >= workers subnets."""
+        if workers <= 1 or "/" not in target:
+            return [target]
+        
+        try:
+            network = ipaddress.ip_network(target, strict=False)
+        except ValueError:
+            return [target]
+        
+        extra_bits = min(
+            (workers - 1).bit_length(),
+            network.max_prefixlen - network.prefixlen,
+        )
+        return [str(subnet) for subnet in network.subnets(prefixlen_diff=extra_bits)]
+
+    def _merge_outputs(self, results: List[ScanResult], output_file: Path) -> None:
+        """
+        Merge the <host> elements of several Nmap XML outputs into one file.
+        
+        The run metadata is rewritten to describe the whole scan: args
+        lists every part's command, runstats/hosts sums the parts' counts
+        and runstats/finished is taken from the part that finished last
+        (its per-part summary text is dropped). The part files are removed
+        once the merged file is written.
+        
+        Raises:
+            ScanExecutionError: If an output cannot be read or written
+        """
+        # Same hardened options as the scan parser: entities in a part file
+        # must not be expanded into the merged output
+        xml_parser = hardened_parser()
+        try:
+            merged = etree.parse(results[0].output_file, xml_parser)
+            root = merged.getroot()
+            runstats = root.find("runstats")
             
-            duration = time.time() - start_time
+            host_counts = {"up": 0, "down": 0, "total": 0}
+            counted = False
+            finished = None
             
-            # Verify output file was created
-            if not output_file.exists():
-                raise ScanExecutionError("Scan completed but output file was not created")
+            for index, result in enumerate(results):
+                part_root = root if index == 0 else etree.parse(
+                    result.output_file, xml_parser
+                ).getroot()
+                
+                hosts = part_root.find("runstats/hosts")
+                if hosts is not None:
+                    counted = True
+                    for key in host_counts:
+                        host_counts[key] += int(hosts.get(key, 0))
+                
+                part_finished = part_root.find("runstats/finished")
+                if part_finished is not None and (
+                    finished is None
+                    or int(part_finished.get("time", 0)) >= int(finished.get("time", 0))
+                ):
+                    finished = part_finished
+                
+                if index == 0:
+                    continue
+                for host in part_root.iterfind("host"):
+                    if runstats is not None:
+                        runstats.addprevious(host)
+                    else:
+                        root.append(host)
             
-            print(f"\n{Fore.GREEN}✓{Style.RESET_ALL} Scan completed in {Fore.GREEN}{duration:.2f}s{Style.RESET_ALL}")
-            self.logger.info(f"Scan completed successfully in {duration:.2f}s: {output_file.name}")
+            root.set("args", "; ".join(shlex.join(result.command) for result in results))
             
-            return ScanResult(
-                target=target,
-                profile=profile,
-                command=command_str,
-                output_file=str(output_file),
-                timestamp=timestamp,
-                success=True,
-                duration=duration,
-            )
-        
-        except subprocess.TimeoutExpired:
-            duration = time.time() - start_time
-            error_msg = f"Scan timed out after {self.timeout} seconds"
-            print(f"\n{Fore.RED}✗{Style.RESET_ALL} {error_msg}")
-            self.logger.error(error_msg)
-            
-            return ScanResult(
-                target=target,
-                profile=profile,
-                command=command_str,
-                output_file=str(output_file),
-                timestamp=timestamp,
-                success=False,
-                duration=duration,
-                error_message=error_msg,
-            )
-        
-        except subprocess.CalledProcessError as exc:
-            duration = time.time() - start_time
-            error_msg = f"Nmap scan failed: {exc.stderr.strip() or 'Unknown error'}"
-            print(f"\n{Fore.RED}✗{Style.RESET_ALL} {error_msg}")
-            self.logger.error(error_msg)
+            if runstats is not None:
+                if counted:
+                    hosts = runstats.find("hosts")
+                    if hosts is None:
+                        hosts = etree.SubElement(runstats, "hosts")
+                    for key, count in host_counts.items():
+                        hosts.set(key, str(count))
+                
+                if finished is not None:
+                    current = runstats.find("finished")
+                    if current is None:
+                        runstats.insert(0, finished)
+                    elif current is not finished:
+                        runstats.replace(current, finished)
+                    finished.attrib.pop("summary", None)
             
-            return ScanResult(
-                target=target,
-                profile=profile,
-                command=command_str,
-                output_file=str(output_file),
-                timestamp=timestamp,
-                success=False,
-                duration=duration,
-                error_message=error_msg,
-            )
+            merged.write(str(output_file), xml_declaration=True, encoding="utf-8")
+        except (OSError, ValueError, etree.XMLSyntaxError) as e:
+            # Part files are kept so a failed merge can be inspected or redone
+            raise ScanExecutionError(f"Failed to merge scan outputs: {e}") from e
         
-        except Exception as e:
-            duration = time.time() - start_time
-            error_msg = f"Unexpected error during scan: {str(e)}"
-            print(f"\n{Fore.RED}✗{Style.RESET_ALL} {error_msg}")
-            self.logger.error(error_msg, exc_info=True)
-            
-            return ScanResult(
-                target=target,
-                profile=profile,
-                command=command_str,
-                output_file=str(output_file),
-                timestamp=timestamp,
-                success=False,
-                duration=duration,
-                error_message=error_msg,
-            )
+        # The merged file now holds every host; drop the parts so they are
+        # not mistaken for standalone scans
+        for result in results:
+            try:
+                Path(result.output_file).unlink()
+            except OSError as e:
+                self.logger.warning(f"Could not remove part file {result.output_file}: {e}")
 
     def list_profiles(self) -> Dict[str, str]:
         """Return available scan profiles with descriptions."""
-        return {
-            name: details["description"]
-            for name, details in SCAN_PROFILES.items()
-        }
\ No newline at end of file
+        return dict(_profiles())
\ No newline at end of file
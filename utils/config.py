@@ -5,9 +5,17 @@ Configuration management for AttackSurfaceX.
 Loads settings from config.yaml and provides access throughout the application.
 """
 
+import json
+import os
 import yaml
 from pathlib import Path
-from typing import Any, Dict
+from typing import Any, Dict, List, Optional
+
+# libyaml's C loader when PyYAML was built with it (much faster to parse)
+try:
+    from yaml import CSafeLoader as SafeLoader
+except ImportError:
+    from yaml import SafeLoader
 
 
 class ConfigManager:
@@ -28,16 +36,82 @@ class ConfigManager:
         """Load configuration from config.yaml file."""
         config_path = Path("config.yaml")
         
-        if not config_path.exists():
+        try:
+            stat = config_path.stat()
+        except FileNotFoundError:
             raise FileNotFoundError(
                 "config.yaml not found. Please create it from the template."
             )
         
+        # Parsed config cached next to config.yaml (JSON loads far faster
+        # than YAML parses); reused while the file's mtime and size match.
+        # The leading format number invalidates caches written before the
+        # round-trip check in _write_cache
+        cache_path = config_path.with_name(config_path.name + ".cache")
+        stamp = [2, stat.st_mtime_ns, stat.st_size]
+        
+        self._config = self._read_cache(cache_path, stamp)
+        if self._config is None:
+            try:
+                with open(config_path, "r", encoding="utf-8") as f:
+                    self._config = yaml.load(f, Loader=SafeLoader)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Invalid YAML in config.yaml: {e}")
+            
+            self._write_cache(cache_path, stamp, self._config)
+        
+        # Every dot-notation path resolved up front (the config is read-only
+        # after load), so get() is a single dict probe
+        self._flat: Dict[str, Any] = {}
+        self._flatten(self._config, "")
+    
+    @staticmethod
+    def _read_cache(cache_path: Path, stamp: List[int]) -> Optional[Dict[str, Any]]:
+        """Return the cached config if it matches the config file stamp."""
+        try:
+            with open(cache_path, "r", encoding="utf-8") as f:
+                cached = json.load(f)
+            if cached.get("stamp") == stamp:
+                return cached["config"]
+        except (OSError, ValueError, KeyError, AttributeError):
+            pass
+        return None
+    
+    @staticmethod
+    def _write_cache(cache_path: Path, stamp: List[int], data: Any) -> None:
+        """Atomically write the config cache; failures only cost speed."""
+        try:
+            payload = json.dumps({"stamp": stamp, "config": data})
+        except (TypeError, ValueError):
+            # Values JSON cannot represent (dates, sets, ...)
+            return
+        
+        # JSON turns non-str keys into strings and tuples into lists; a
+        # config that would not load back identically is never cached
+        if json.loads(payload)["config"] != data:
+            return
+        
+        tmp_path = cache_path.with_name(f".{cache_path.name}.{os.getpid()}.tmp")
         try:
-            with open(config_path, "r", encoding="utf-8") as f:
-                self._config = yaml.safe_load(f)
-        except yaml.YAMLError as e:
-            raise ValueError(f"Invalid YAML in config.yaml: {e}")
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                f.write(payload)
+            os.replace(tmp_path, cache_path)
+        except OSError:
+            # Read-only directory
+            try:
+                tmp_path.unlink()
+            except OSError:
+                pass
+    
+    def _flatten(self, node: Any, prefix: str) -> None:
+        """Index every key path of a (nested) mapping into self._flat."""
+        if not isinstance(node, dict):
+            return
+        
+        for key, value in node.items():
+            key_path = f"{prefix}{key}"
+            self._flat[key_path] = value
+            self._flatten(value, f"{key_path}.")
     
     def get(self, key_path: str, default: Any = None) -> Any:
         """
@@ -47,15 +121,7 @@ class ConfigManager:
             config.get("scan.default_target")
             config.get("paths.database")
         """
-        keys = key_path.split(".")
-        value = self._config
-        
-        try:
-            for key in keys:
-                value = value[key]
-            return value
-        except (KeyError, TypeError):
-            return default
+        return self._flat.get(key_path, default)
     
     def get_all(self) -> Dict[str, Any]:
         """Return the entire configuration dictionary."""
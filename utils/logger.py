@@ -5,21 +5,54 @@ Centralized logging configuration for AttackSurfaceX.
 Provides consistent logging across all modules.
 """
 
+import atexit
 import logging
+import queue
 import sys
+import time
 from pathlib import Path
-from logging.handlers import RotatingFileHandler
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler
 from datetime import datetime
 
 from utils.config import config
 
 
+# The log format uses none of these record fields; skip gathering them
+logging.logThreads = False
+logging.logProcesses = False
+logging.logMultiprocessing = False
+
+
+class _CachedTimeFormatter(logging.Formatter):
+    """
+    Formatter that renders the timestamp once per second.
+    
+    The date format has one-second resolution, so every record logged
+    within the same second reuses the same asctime string.
+    """
+    
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (second, rendered) swapped as one tuple: the console and the
+        # queued file handler share this formatter across threads
+        self._cached_time = (None, "")
+    
+    def formatTime(self, record: logging.LogRecord, datefmt=None) -> str:
+        second = int(record.created)
+        cached_second, rendered = self._cached_time
+        if second != cached_second:
+            rendered = time.strftime(datefmt or self.datefmt, self.converter(second))
+            self._cached_time = (second, rendered)
+        return rendered
+
+
 class LoggerSetup:
     """
     Configures application-wide logging with both console and file output.
     """
     
     _initialized = False
+    _listener = None
     
     @classmethod
     def setup(cls) -> logging.Logger:
@@ -45,7 +78,7 @@ class LoggerSetup:
         logger.setLevel(numeric_level)
         
         # Create formatter
-        formatter = logging.Formatter(
+        formatter = _CachedTimeFormatter(
             fmt="%(asctime)s | %(levelname)-8s | %(name)s | %(message)s",
             datefmt="%Y-%m-%d %H:%M:%S"
         )
@@ -72,7 +105,18 @@ class LoggerSetup:
             )
             file_handler.setLevel(numeric_level)
             file_handler.setFormatter(formatter)
-            logger.addHandler(file_handler)
+            
+            # File writes (and rotation) happen on a listener thread; the
+            # logging call only enqueues the record. The console handler
+            # stays synchronous so log lines keep their order with print()
+            log_queue = queue.SimpleQueue()
+            logger.addHandler(QueueHandler(log_queue))
+            cls._listener = QueueListener(
+                log_queue, file_handler, respect_handler_level=True
+            )
+            cls._listener.start()
+            # Drain queued records before the interpreter exits
+            atexit.register(cls._listener.stop)
         
         cls._initialized = True
         logger.info("Logging system initialized")